@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Build time of a batch of networks with and without the DK1/DK2 template
+(base_network in denmark/models.py).
+
+"scratch" builds the core of every network with new_network and
+add_denmark, "template" copies it from the template, which is built by the
+first call. Run from the repository root:
+
+    python benchmarks/base_template.py
+"""
+
+#%% Import and define
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from denmark import models
+from denmark.bench import timer
+from denmark.data import load_elec
+
+n = 20 # networks per batch
+
+df_elec = load_elec()
+
+#%% DK1/DK2 core
+timings = {}
+with timer(timings, 'scratch'):
+    for i in range(n):
+        network = models.new_network(2017)
+        models.add_denmark(network, df_elec)
+with timer(timings, 'first template'):
+    models.base_network(df_elec)
+with timer(timings, 'template'):
+    for i in range(n):
+        models.base_network(df_elec)
+
+#%% Full builders, all starting from the template
+for name in ['co2_h2', 'heat', 'international']:
+    with timer(timings, name):
+        for i in range(n):
+            models.builders[name](df_elec)
+
+#%% Results
+df = pd.Series(timings).to_frame('total (s)')
+df['per network (s)'] = df['total (s)']/pd.Series(n, df.index).where(df.index != 'first template', 1)
+print(df)
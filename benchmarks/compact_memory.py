@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of compact mode (float32 time series, see denmark/compact.py) in the
+international connected model.
+
+Builds and solves the model with float64 and with float32 time series and
+prints the memory of the input data and of the network time series, the
+objective and the optimal capacities. Run from the repository root:
+
+    python benchmarks/compact_memory.py
+"""
+
+#%% Import and define
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from denmark import results
+from denmark.bench import timer
+from denmark.compact import memory_usage
+from denmark.data import load_elec
+from denmark.models import build_international
+from denmark.solve import solve
+
+solver_name = 'gurobi'
+
+#%% Build and solve
+table = {}
+capacity = {}
+for compact in [False, True]:
+    timings = {}
+    df_elec = load_elec(compact=compact)
+    with timer(timings, 'build'):
+        network = build_international(df_elec, hydro_compact=True, compact=compact)
+    inputs = memory_usage(network)
+    with timer(timings, 'solve'):
+        solve(network, solver_name=solver_name, compact=compact)
+
+    key = 'float32' if compact else 'float64'
+    table[key] = {'df_elec [MB]': df_elec.memory_usage(index=False).sum()/1024**2,
+                  'inputs [MB]': inputs,
+                  'inputs and results [MB]': memory_usage(network),
+                  'build [s]': timings['build'],
+                  'solve [s]': timings['solve'],
+                  'objective [1e6 €]': network.objective/1e6}
+    capacity[key] = results.summary(network).capacity
+
+#%% Results
+table = pd.DataFrame(table)
+table['ratio'] = table.float32/table.float64
+print(table)
+
+# Capacities should agree to solver tolerance
+capacity = pd.DataFrame(capacity)
+capacity['difference'] = capacity.float32 - capacity.float64
+print(capacity)
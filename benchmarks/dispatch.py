@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Merit-order dispatch (denmark/dispatch.py) against the LP.
+
+Solves the CO2/H2 model with its default CO2 limit, so H2 storage is built,
+compares the simulated dispatch at p_nom_opt with the LP and then scores
+random capacity mixes of 50-150% of p_nom_opt, with the storage loop
+compiled by numba and in numpy. Run from the repository root:
+
+    python benchmarks/dispatch.py
+"""
+
+#%% Import and define
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from denmark import dispatch
+from denmark.bench import timer
+from denmark.models import build_co2_h2
+from denmark.solve import solve
+
+solver_name = 'gurobi'
+n_mixes = 5000
+
+#%% Solve and validate
+timings = {}
+network = build_co2_h2()
+with timer(timings, 'LP'):
+    solve(network, solver_name=solver_name)
+with timer(timings, 'validate'):
+    validation = dispatch.validate(network)
+
+#%% Random mixes
+base = dispatch.capacities(network)
+base = base[base > 0]
+rng = np.random.default_rng(0)
+mixes = pd.DataFrame(base.to_numpy()*rng.uniform(0.5, 1.5, size=(n_mixes, len(base))), columns=base.index)
+with timer(timings, 'simulate'):
+    scores = dispatch.simulate(network, mixes)
+with timer(timings, 'simulate numpy'):
+    numpy_scores = dispatch.simulate(network, mixes, compiled=False)
+
+#%% Results
+print(', '.join('%s %.2f s' % item for item in timings.items()))
+print('%.0f mixes/s, %.0f mixes/s with the numpy storage loop'
+      % (n_mixes/timings['simulate'], n_mixes/timings['simulate numpy']))
+print('largest relative difference of the two: %.1e'
+      % ((scores - numpy_scores).abs().max()/scores.abs().max().replace(0, 1)).max())
+print(validation)
+print(scores.sort_values('cost').head(10))
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the two hydro reservoir representations in the international
+connected model (see denmark/hydro.py).
+
+Builds and solves the model with the original layout and with the compact
+StorageUnit in all four hydro zones, prints LP size, solve time and hydro
+dispatch and checks that both have the same objective. Run from the
+repository root:
+
+    python benchmarks/hydro_reservoir.py
+"""
+
+#%% Import and define
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from denmark.bench import lp_size, timer
+from denmark.data import load_elec
+from denmark.hydro import fixed_hydro_cost, hydro_dispatch
+from denmark.models import build_international, hydro_zones
+from denmark.solve import solve
+
+solver_name = 'gurobi'
+
+df_elec = load_elec()
+
+#%% Build and solve
+results = {}
+for compact in [False, True]:
+    timings = {}
+    with timer(timings, 'build'):
+        network = build_international(df_elec, hydro_compact=compact)
+    variables, constraints = lp_size(network)
+    with timer(timings, 'solve'):
+        solve(network, solver_name)
+
+    key = 'compact' if compact else 'original'
+    results[key] = {'variables': variables,
+                    'constraints': constraints,
+                    'build [s]': timings['build'],
+                    'lopf [s]': timings['solve'],
+                    # the compact layout leaves out the constant inflow generator cost
+                    'objective [1e6 €]': (network.objective + compact*fixed_hydro_cost(network))/1e6}
+    for zone in hydro_zones:
+        results[key]['hydro %s [TWh]' % zone] = hydro_dispatch(network, zone).sum()/1e6
+
+#%% Results
+results = pd.DataFrame(results)
+results['ratio'] = results.compact/results.original
+print(results)
+objectives = results.loc['objective [1e6 €]']
+print('objectives match' if abs(objectives.compact - objectives.original) <= 1e-6*abs(objectives.original)
+      else 'objectives differ by %.3g 1e6 €' % (objectives.compact - objectives.original))
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+Inflow-year ensemble (denmark/ensemble.py) of the international model.
+
+Solves the model for the inflow years 2003-2012 in parallel, with df_elec
+shared between the workers, and prints the peak hydro turbine output and
+reservoir filling and the DK imports per year, their spread and the wall
+time. Run from the repository root:
+
+    python benchmarks/inflow_ensemble.py
+"""
+
+#%% Import and define
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from denmark import ensemble
+from denmark.bench import timer
+
+solver_name = 'gurobi'
+processes = 4
+
+#%% Run the ensemble
+if __name__ == '__main__':
+    timings = {}
+    with timer(timings, 'ensemble'):
+        df = ensemble.ensemble(processes=processes, hydro_compact=True, solver_name=solver_name)
+
+    with pd.option_context('display.width', 200, 'display.max_columns', 20):
+        print(df)
+        print(ensemble.spread(df))
+    print('%d inflow years with %d processes: %.0f s' % (len(df), processes, timings['ensemble']))
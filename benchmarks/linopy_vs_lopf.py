@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Side-by-side comparison of the two build paths in denmark/solve.py on the
+international connected model: network.lopf (LP file written to disk) and
+network.optimize (linopy model handed to the solver in memory).
+
+Each backend runs in a fresh process so that build time, peak memory and
+end-to-end time are not influenced by the other run. Run from the repository
+root:
+
+    python benchmarks/linopy_vs_lopf.py
+"""
+
+#%% Import and define
+import multiprocessing
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from denmark.bench import peak_memory, timer
+from denmark.data import load_elec
+from denmark.models import build_international
+from denmark.solve import backends, build_model, solve
+
+solver_name = 'gurobi'
+hydro_compact = True
+
+
+def run(backend):
+    """Build and solve the international model with one backend"""
+
+    timings = {}
+    df_elec = load_elec()
+    with timer(timings, 'network [s]'):
+        network = build_international(df_elec, hydro_compact=hydro_compact)
+    with timer(timings, 'build [s]'):
+        build_model(network, backend)
+    timings['peak memory after build [MB]'] = peak_memory()
+
+    network = build_international(df_elec, hydro_compact=hydro_compact)
+    with timer(timings, 'build and solve [s]'):
+        solve(network, solver_name=solver_name, backend=backend)
+    timings['end-to-end [s]'] = timings['network [s]'] + timings['build and solve [s]']
+    timings['peak memory [MB]'] = peak_memory()
+    timings['objective [1e6 €]'] = network.objective/1e6
+    return timings
+
+
+#%% Run
+if __name__ == '__main__':
+    ctx = multiprocessing.get_context('spawn')
+    results = {}
+    for backend in backends:
+        with ctx.Pool(1) as pool:
+            results[backend] = pool.apply(run, (backend,))
+
+    results = pd.DataFrame(results)
+    results['linopy/lopf'] = results.linopy/results.lopf
+    print(results)
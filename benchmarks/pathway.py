@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Myopic pathway (denmark/pathway.py) of the CO2/H2 model from 2025 to 2050.
+
+Runs the pathway with both backends and prints the capacity per period,
+the objectives and the solve time of every period: lopf writes a new LP
+file for every period, linopy changes the bounds of the model it built for
+the first period. Both start every period from the gurobi basis of the one
+before. Run from the repository root:
+
+    python benchmarks/pathway.py
+"""
+
+#%% Import and define
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from denmark import pathway
+from denmark.data import load_elec
+from denmark.models import build_co2_h2
+
+solver_name = 'gurobi'
+
+df_elec = load_elec()
+
+#%% Pathways
+runs = {}
+for backend in ['lopf', 'linopy']:
+    network = build_co2_h2(df_elec)
+    runs[backend] = pathway.pathway(network, solver_name=solver_name, backend=backend)
+
+#%% Results
+with pd.option_context('display.width', 200, 'display.max_columns', 20):
+    print(runs['linopy']['capacity'].round(0))
+    print(runs['linopy']['retired'].round(0))
+    print(pd.DataFrame({'%s %s' % (backend, name): run[name] for backend, run in runs.items()
+                        for name in ['objective', 'time']}))
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput of the pipelined executor (denmark/pipeline.py) against running
+build, solve and report of every scenario one after the other.
+
+Runs the CO2/H2 model for a range of CO2 limits both ways, saving results
+to a temporary result store and plotting the generation, and prints wall
+time, scenarios/hour and the mean time of every step. Run from the
+repository root:
+
+    python benchmarks/pipeline.py
+"""
+
+#%% Import and define
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from denmark.bench import timer
+from denmark.pipeline import pipeline, sequential
+from denmark.scenarios import grid
+
+scenarios = grid({'model': 'co2_h2'}, co2_limit=[None] + [23.6*10**6*share for share in [0.2, 0.1, 0.05, 0.025, 0.01, 0.005, 0.0]])
+
+
+#%% Run
+if __name__ == '__main__':
+    timings = {}
+    runs = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, run in [('sequential', sequential), ('pipeline', pipeline)]:
+            root = os.path.join(directory, name)
+            with timer(timings, name):
+                runs[name] = run(scenarios, store=os.path.join(root, 'results'),
+                                 plot_dir=os.path.join(root, 'plots'), log=None)
+
+    table = {}
+    for name, jobs in runs.items():
+        jobs = pd.DataFrame(jobs).T
+        table[name] = {'wall time [s]': timings[name],
+                       'scenarios/hour': len(scenarios)/timings[name]*3600,
+                       'mean build [s]': jobs['build [s]'].mean(),
+                       'mean solve [s]': jobs['solve [s]'].mean(),
+                       'mean report [s]': jobs['report [s]'].mean()}
+    table = pd.DataFrame(table)
+    table['pipeline/sequential'] = table.pipeline/table.sequential
+    print(table)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Numerical scaling (denmark/scaling.py) of the CO2/H2 model.
+
+Prints the coefficient ranges in MW, € and t and in GW, k€ and kt and
+solves the model both ways with the barrier method. Run from the
+repository root:
+
+    python benchmarks/scaling.py
+"""
+
+#%% Import and define
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from denmark import scaling
+from denmark.bench import timer
+from denmark.data import load_elec
+from denmark.models import build_co2_h2
+from denmark.solve import solve
+
+solver_name = 'gurobi'
+solver_options = {'Method': 2, 'Crossover': 0} # barrier only
+
+df_elec = load_elec()
+
+#%% Coefficient ranges
+network = build_co2_h2(df_elec)
+before = scaling.coefficient_ranges(network)
+factors = scaling.scale(network)
+after = scaling.coefficient_ranges(network)
+scaling.unscale(network, factors)
+print(pd.concat({'MW, €, t': before, 'GW, k€, kt': after}, axis=1))
+
+#%% Solve unscaled and scaled
+timings = {}
+objectives = {}
+for scale in [False, True]:
+    network = build_co2_h2(df_elec)
+    with timer(timings, scale):
+        solve(network, solver_name=solver_name, solver_options=dict(solver_options), scale=scale)
+    objectives[scale] = network.objective
+
+#%% Results
+df = pd.DataFrame({'solve time (s)': timings, 'objective (€)': objectives})
+df.index = ['unscaled', 'scaled']
+print(df)
+print('solve time change: %.1f%%' % (100*(timings[True]/timings[False] - 1)))
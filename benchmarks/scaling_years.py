@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Scaling of the DK1/DK2 model with the number of weather years.
+
+Builds the model of denmark/models.py add_denmark over 1 to 30 synthetic
+weather years (block bootstrap of 2017, see denmark/synthetic.py) and prints
+LP size, build and solve time and optimal capacities per year count. Run from
+the repository root:
+
+    python benchmarks/scaling_years.py
+"""
+
+#%% Import and define
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from denmark import results
+from denmark.bench import lp_size, peak_memory, timer
+from denmark.models import add_denmark, new_network
+from denmark.solve import solve
+from denmark.synthetic import synthetic_elec
+
+solver_name = 'gurobi'
+seed = 0
+year_counts = [1, 5, 10, 30]
+
+#%% Build and solve
+table = {}
+for n in year_counts:
+    timings = {}
+    df_elec = synthetic_elec(range(2017, 2017 + n), seed=seed)
+    with timer(timings, 'build'):
+        network = new_network(2017)
+        network.set_snapshots(df_elec.index)
+        add_denmark(network, df_elec)
+    variables, constraints = lp_size(network)
+    with timer(timings, 'solve'):
+        solve(network, solver_name=solver_name)
+
+    capacity = results.summary(network).capacity.groupby(level='carrier').sum()
+    table[n] = {'snapshots': len(network.snapshots),
+                'variables': variables,
+                'constraints': constraints,
+                'build [s]': timings['build'],
+                'solve [s]': timings['solve'],
+                'solve per year [s]': timings['solve']/n,
+                'peak memory [MB]': peak_memory()}
+    table[n].update(('%s [MW]' % carrier, value) for carrier, value in capacity.items())
+
+#%% Results
+print(pd.DataFrame(table))
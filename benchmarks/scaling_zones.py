@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Scaling of the international model with the number of buses.
+
+Adds synthetic zones (denmark/synthetic.py, block bootstraps of the measured
+zones) with synthetic links to the zones and links of data/zones.csv and
+data/links.csv, from the 7 buses of the international model up to 50, and
+prints LP size, build and solve time per bus count. Run from the repository
+root:
+
+    python benchmarks/scaling_zones.py
+"""
+
+#%% Import and define
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from denmark import results
+from denmark.bench import lp_size, peak_memory, timer
+from denmark.data import load_elec, load_topology
+from denmark.models import build_international
+from denmark.solve import solve
+from denmark.synthetic import synthetic_topology, synthetic_zones
+
+solver_name = 'gurobi'
+seed = 0
+bus_counts = [7, 12, 25, 50]
+
+df_elec = load_elec()
+zones, links = load_topology()
+base = 2 + len(zones) # dk1, dk2 and the zones of data/zones.csv
+
+extra = synthetic_zones(max(bus_counts) - base, [2017], seed=seed, df_elec=df_elec)
+df_elec = pd.concat([df_elec, extra], axis=1)
+extra_zones, extra_links = synthetic_topology(max(bus_counts) - base, seed=seed)
+
+#%% Build and solve
+table = {}
+for n in bus_counts:
+    timings = {}
+    with timer(timings, 'build'):
+        network = build_international(df_elec, hydro_compact=True,
+                                      zones=pd.concat([zones, extra_zones.iloc[:n - base]]),
+                                      links=pd.concat([links, extra_links]))
+    variables, constraints = lp_size(network)
+    with timer(timings, 'solve'):
+        solve(network, solver_name=solver_name)
+
+    table[n] = {'buses': len(results.zones(network)),
+                'links': len(network.links),
+                'variables': variables,
+                'constraints': constraints,
+                'build [s]': timings['build'],
+                'solve [s]': timings['solve'],
+                'peak memory [MB]': peak_memory(),
+                'objective [1e6 €]': network.objective/1e6}
+
+#%% Results
+print(pd.DataFrame(table))
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput of the resource-aware scheduler (denmark/scheduler.py) against
+naive parallelism, where as many jobs as cores are started at once and every
+solver uses its default number of threads.
+
+Runs the CO2/H2 model for a range of CO2 limits both ways and prints wall
+time, jobs/hour and the peak memory per job. Run from the repository root:
+
+    python benchmarks/scheduler.py
+"""
+
+#%% Import and define
+import multiprocessing
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from denmark.bench import timer
+from denmark.scenarios import grid
+from denmark.scheduler import estimate_memory, run_job, schedule
+
+cores = os.cpu_count()
+scenarios = grid({'model': 'co2_h2'}, co2_limit=[None] + [23.6*10**6*share for share in [0.2, 0.1, 0.05, 0.025, 0.01, 0.005, 0.0]])
+
+
+#%% Run
+if __name__ == '__main__':
+    estimates = estimate_memory(scenarios)
+    timings = {}
+
+    with timer(timings, 'naive'):
+        # one job per process, for the peak memory of every job
+        with multiprocessing.get_context('spawn').Pool(cores, maxtasksperchild=1) as pool:
+            naive = pool.starmap(run_job, [(scenario, None) for scenario in scenarios])
+
+    with timer(timings, 'scheduled'):
+        scheduled = schedule(scenarios, cores=cores, memory_estimates=estimates, log=None)
+
+    table = {}
+    for name, jobs in [('naive', naive), ('scheduled', list(scheduled.values()))]:
+        jobs = pd.DataFrame(jobs)
+        table[name] = {'wall time [s]': timings[name],
+                       'jobs/hour': len(scenarios)/timings[name]*3600,
+                       'mean run time [s]': jobs['run time [s]'].mean(),
+                       'max peak memory [MB]': jobs['peak memory [MB]'].max()}
+    table = pd.DataFrame(table)
+    table['scheduled/naive'] = table.scheduled/table.naive
+    print('%d cores, memory estimate %.0f MB per job' % (cores, max(estimates)))
+    print(table)
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Screening estimate (denmark/screening.py) against the LP.
+
+Estimates the DK1/DK2 mix from df_elec, prunes the network before solving
+and compares the estimate with p_nom_opt of the CO2/H2 model without a CO2
+limit. Run from the repository root:
+
+    python benchmarks/screening.py
+"""
+
+#%% Import and define
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from denmark import screening
+from denmark.bench import timer
+from denmark.data import load_elec
+from denmark.models import build_co2_h2
+from denmark.solve import solve
+
+solver_name = 'gurobi'
+
+df_elec = load_elec()
+
+#%% Estimate, build and solve
+timings = {}
+with timer(timings, 'estimate'):
+    capacity = screening.estimate_denmark(df_elec)
+with timer(timings, 'build'):
+    network = build_co2_h2(df_elec, co2_limit=None)
+with timer(timings, 'prune'):
+    removed = screening.prune(network)
+with timer(timings, 'solve'):
+    solve(network, solver_name=solver_name)
+
+#%% Results
+print(', '.join('%s %.2f s' % item for item in timings.items()))
+print('pruned: %s' % (', '.join(removed) or 'nothing'))
+print(screening.accuracy(capacity, network))
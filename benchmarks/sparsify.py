@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Sparsification (denmark/sparsify.py) of the International model.
+
+For every threshold the capacity factors below it are set to zero and the
+dispatch of all zero hours is fixed, then the linopy model is solved.
+Prints the snapped values, the matrix nonzeros of the lopf LP file and of
+the linopy model, the fixed variables, the solve time and the objective
+deviation from threshold 0. lopf only gets the zeroed values, the fixed
+variables are left to the presolve of the solver. Run from the repository
+root:
+
+    python benchmarks/sparsify.py
+"""
+
+#%% Import and define
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from denmark import sparsify
+from denmark.bench import timer
+from denmark.data import load_elec
+from denmark.models import build_international
+from denmark.solve import build_model
+
+solver_name = 'gurobi'
+thresholds = [0, 1e-4, 1e-3, 1e-2]
+
+df_elec = load_elec()
+
+#%% Solve for every threshold
+rows = []
+for threshold in thresholds:
+    timings = {}
+    network = build_international(df_elec)
+    snapped = sparsify.sparsify(network, threshold)
+    lopf = sparsify.nonzeros(network, backend='lopf')
+    build_model(network, backend='linopy')
+    fixed = sparsify.fix_zero_hours(network)
+    with timer(timings, 'solve'):
+        network.optimize.solve_model(solver_name=solver_name)
+    rows.append({'threshold': threshold, 'snapped': snapped, 'nonzeros lopf': lopf,
+                 'nonzeros linopy': sparsify.nonzeros(network), 'fixed variables': fixed,
+                 'solve (s)': timings['solve'], 'objective': network.objective})
+
+#%% Results
+df = pd.DataFrame(rows).set_index('threshold')
+for backend in ['lopf', 'linopy']:
+    df['reduction %s' % backend] = 1 - df['nonzeros %s' % backend]/df['nonzeros %s' % backend].iloc[0]
+df['objective deviation'] = df.objective/df.objective.iloc[0] - 1
+print(df)
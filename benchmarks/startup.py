@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Startup time of a batch worker compared to the imports the scripts used to
+make at the top (pypsa, matplotlib.pyplot, matplotlib.dates and
+pandas.tseries.offsets).
+
+Every case is imported in a fresh interpreter, repeated a number of times,
+and the median wall time is printed. Run from the repository root:
+
+    python benchmarks/startup.py
+"""
+
+#%% Import and define
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+repeat = 5
+
+cases = {
+    'scripts before split': 'import pypsa, pandas, numpy, matplotlib.pyplot, matplotlib.dates; '
+                            'from pandas.tseries.offsets import DateOffset',
+    'coordinator': 'import denmark.models, denmark.results',
+    'worker (model code)': 'import denmark.models, denmark.solve, denmark.results; '
+                           'denmark.models.new_network(2017)',
+    'worker with reports': 'import denmark.models, denmark.solve, denmark.plots; '
+                           'denmark.plots.pyplot()',
+    'python only': 'pass',
+}
+
+
+def startup_time(code):
+    """Median wall time in s of starting python and running code"""
+
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=root, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+#%% Run
+if __name__ == '__main__':
+    for case, code in cases.items():
+        print('%-22s %.3f s' % (case, startup_time(code)))
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Surrogate model (denmark/surrogate.py) of the CO2/H2 model over the CO2
+limit.
+
+Solves a coarse grid of CO2 limits into a temporary result store, predicts
+the scenarios of a finer grid with every method, compares with solving them
+and prints the query time and the scenarios proposed next. Run from the
+repository root:
+
+    python benchmarks/surrogate.py
+"""
+
+#%% Import and define
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from denmark import surrogate
+from denmark.bench import timer
+from denmark.scenarios import grid, run, scenario_key
+from denmark.store import ResultStore
+
+emissions = 23.6*10**6 # tCO2 of Danish electricity, the CO2 limits are shares of it
+train = grid({'model': 'co2_h2'}, co2_limit=[emissions*share for share in [0.2, 0.1, 0.05, 0.025, 0.01, 0.0]])
+test = grid({'model': 'co2_h2'}, co2_limit=[emissions*share for share in [0.15, 0.075, 0.04, 0.015, 0.005]])
+methods = ['gp', 'gbr', 'knn'] if surrogate._sklearn() else ['knn']
+
+#%% Solve the training and test scenarios
+with tempfile.TemporaryDirectory() as directory:
+    store = ResultStore(directory)
+    for scenario in train + test:
+        store.save(scenario_key(scenario), scenario, run(scenario))
+    X, targets = surrogate.training_data(store, [scenario_key(s) for s in train])
+    _, truth = surrogate.training_data(store, [scenario_key(s) for s in test])
+
+#%% Fit and predict
+rows = {}
+for method in methods:
+    timings = {}
+    with timer(timings, 'fit'):
+        model = surrogate.Surrogate(method).fit(X, targets)
+    with timer(timings, 'query'):
+        mean, std = model.query(test)
+    error = (mean.cost.to_numpy() - truth.cost.to_numpy())/truth.cost.to_numpy()
+    rows[method] = {'fit [s]': timings['fit'], 'query [ms]': 1000*timings['query']/len(test),
+                    'mean abs cost error': abs(error).mean(),
+                    'mean cost std/cost': (std.cost/mean.cost).abs().mean(),
+                    'next': [s['co2_limit'] for s in model.propose(test, n=2)]}
+
+#%% Results
+print(pd.DataFrame(rows).T)
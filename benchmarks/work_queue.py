@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput of the scenario work queue (see denmark/workqueue.py) with several
+local worker processes.
+
+Submits the CO2/H2 model for a range of CO2 limits with and without compact
+time series, starts the workers, kills one of them after the first minute to
+check that its job is requeued, and prints the queue metrics. Run from the
+repository root:
+
+    python benchmarks/work_queue.py
+"""
+
+#%% Import and define
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+from denmark import workqueue
+from denmark.scenarios import grid
+
+workers = 3
+kill_after = 60 # s
+lost_after = 2*workqueue.heartbeat_interval # s, requeue the job of the killed worker quickly
+
+scenarios = grid({'model': 'co2_h2'}, co2_limit=[None] + [23.6*10**6*share for share in [0.1, 0.05, 0.025, 0.01]],
+                 compact=[False, True])
+
+#%% Run
+if __name__ == '__main__':
+    path = os.path.join(tempfile.mkdtemp(), 'queue.db')
+    queue = workqueue.WorkQueue(path)
+    queue.submit(scenarios)
+
+    processes = [subprocess.Popen([sys.executable, '-m', 'denmark.workqueue', path, 'worker'], cwd=root)
+                 for i in range(workers)]
+    start = time.time()
+    killed = False
+    requeued = 0
+    while any(process.poll() is None for process in processes):
+        if not killed and time.time() - start > kill_after:
+            processes[0].kill()
+            killed = True
+        requeued += queue.requeue_lost(lost_after)
+        time.sleep(5)
+    # the surviving workers may finish before the lost job is requeued
+    if queue.metrics()['running']:
+        time.sleep(lost_after)
+        requeued += queue.requeue_lost(lost_after)
+        workqueue.work(path)
+
+    metrics = queue.metrics()
+    print('wall time %.0f s, %d jobs requeued' % (time.time() - start, requeued))
+    for key, value in metrics.items():
+        print('%s: %s' % (key, value))
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""
+Shared model code for the Denmark scripts.
+
+The scripts in the repository root are run cell by cell (e.g. in Spyder) from
+the repository root. Code that is reused between scripts, benchmarks and batch
+runs lives in this package.
+"""
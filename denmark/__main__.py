@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Build and solve one model without plotting, e.g.
+
+    python -m denmark international --backend linopy
+    python -m denmark interannual --year 2018
+    python -m denmark international --checkpoint checkpoints/
+
+Prints the capacity per zone and carrier. Only the model code is imported,
+matplotlib is never loaded.
+"""
+
+import argparse
+import time
+
+start = time.perf_counter()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m denmark', description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('model', choices=['co2_h2', 'heat', 'interannual', 'international'])
+    parser.add_argument('--year', type=int, default=2017, help='year of the interannual model')
+    parser.add_argument('--solver', default='gurobi')
+    parser.add_argument('--backend', default='lopf', choices=['lopf', 'linopy'])
+    parser.add_argument('--checkpoint', metavar='DIR',
+                        help='save the data, built and solved network in DIR and resume from them')
+    parser.add_argument('--restart', action='store_true', help='ignore existing checkpoints')
+    args = parser.parse_args()
+
+    from denmark import results
+    from denmark.scenarios import run
+    print('startup %.2f s' % (time.perf_counter() - start))
+
+    scenario = {'model': args.model, 'solver': args.solver, 'backend': args.backend}
+    if args.model == 'interannual':
+        scenario['year'] = args.year
+    if args.checkpoint:
+        from denmark import checkpoint
+        network = checkpoint.run(scenario, args.checkpoint, resume=not args.restart)
+    else:
+        network = run(scenario)
+
+    print(network.objective/network.loads_t.p.sum().sum()) # €/MWh
+    print(results.summary(network).capacity.unstack('zone')) #in MW
+
+
+if __name__ == '__main__':
+    main()
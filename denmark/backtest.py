@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Backtest of the model prices against historical day-ahead prices.
+
+The marginal price of every zone (buses_t.marginal_price) is compared with
+the day-ahead prices in the entsoe data (DK_1_price_day_ahead, ...,
+SE_4_price_day_ahead) over the hours where both exist. All metrics are
+computed for all zones in one pass over the hours x zones arrays:
+
+- mae: mean absolute error in €/MWh
+- bias: mean of model minus historical price in €/MWh
+- rmse: root mean square error in €/MWh
+- correlation: Pearson correlation of the hourly prices
+- duration mismatch: mean absolute difference of the two price-duration
+  curves in €/MWh, i.e. how well the distribution of prices is matched
+  regardless of the hour
+
+backtest(network, df_elec) is cached on the network for the prices in
+df_elec, stored(store, key, df_elec) on disk next to the results of a
+scenario (see denmark.store), so calibration sweeps can rank many scenarios
+with rank().
+"""
+
+import numpy as np
+import pandas as pd
+
+from denmark import duration, results
+from denmark.data import zone_name
+
+price_suffix = '_price_day_ahead'
+
+
+def historical_prices(df_elec):
+    """Day-ahead prices in €/MWh per zone of the entsoe data, zones named
+    like in the models (DK_1 -> dk1)"""
+
+    columns = [c for c in df_elec.columns if c.endswith(price_suffix)]
+    df = df_elec[columns].astype(float)
+    df.columns = [zone_name(c[:-len(price_suffix)]) for c in columns]
+    return df
+
+
+def metrics(model, history):
+    """Error metrics of the model prices per zone, for the zones and hours in
+    both model and history. Hours without a historical price are left out"""
+
+    zones = model.columns.intersection(history.columns)
+    history = history.reindex(index=model.index, columns=zones).to_numpy(dtype=float)
+    model = model[zones].to_numpy(dtype=float)
+    valid = ~np.isnan(history) & ~np.isnan(model)
+    n = valid.sum(axis=0)
+    m = np.where(valid, model, np.nan)
+    h = np.where(valid, history, np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        error = m - h
+        dm = m - np.nanmean(m, axis=0)
+        dh = h - np.nanmean(h, axis=0)
+        correlation = np.nansum(dm*dh, axis=0)/np.sqrt(np.nansum(dm**2, axis=0)*np.nansum(dh**2, axis=0))
+        # both duration curves over the same hours, NaN sorted last
+        curves = np.abs(-np.sort(-m, axis=0) + np.sort(-h, axis=0))
+        return pd.DataFrame({'hours': n,
+                             'mae': np.nanmean(np.abs(error), axis=0),
+                             'bias': np.nanmean(error, axis=0),
+                             'rmse': np.sqrt(np.nanmean(error**2, axis=0)),
+                             'correlation': correlation,
+                             'duration mismatch': np.nansum(curves, axis=0)/n},
+                            index=pd.Index(zones, name='zone'))
+
+
+def _hash(history):
+    """Hash of the historical prices, to tell which prices a backtest used"""
+
+    return '%016x' % (int(pd.util.hash_pandas_object(history).sum()) % 2**64)
+
+
+def backtest(network, df_elec):
+    """Error metrics of the marginal prices of a solved network against the
+    day-ahead prices in df_elec, one row per zone with historical prices.
+    Cached on the network per price data until it is solved again"""
+
+    history = historical_prices(df_elec)
+    key = ('backtest', _hash(history))
+    return results._cached(network, key, lambda network: metrics(duration.prices(network), history))
+
+
+def stored(store, key, df_elec):
+    """Backtest of a stored scenario (see denmark.store), computed from the
+    stored prices on first use and then read from the store as long as the
+    historical prices in df_elec are the same"""
+
+    history = historical_prices(df_elec)
+    digest = _hash(history)
+    if store.has(key, 'backtest'):
+        df = store.read(key, 'backtest')
+        if 'history' in df.columns and (df.history == digest).all():
+            return df.drop(columns='history').set_index('zone')
+    df = metrics(store.read(key, 'prices'), history)
+    store.write(key, 'backtest', df.reset_index().assign(history=digest))
+    return df
+
+
+def rank(store, keys, df_elec, metric='mae'):
+    """Scenarios sorted by the mean of metric over the zones, best first. For
+    correlation higher is better, for the other metrics lower"""
+
+    table = pd.DataFrame({key: stored(store, key, df_elec)[metric] for key in keys}).T
+    table['mean'] = table.mean(axis=1)
+    return table.sort_values('mean', ascending=metric != 'correlation')
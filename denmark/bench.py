@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for the scripts in benchmarks/.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+
+
+@contextmanager
+def timer(timings, key):
+    """Store the wall time (in s) spent inside the with block in timings[key]"""
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[key] = time.perf_counter() - start
+
+
+def lp_size(network):
+    """Estimate the number of variables and constraints of the LP built by
+    network.lopf, counted from the components. Returns (variables, constraints)"""
+
+    T = len(network.snapshots)
+    variables = 0
+    constraints = T*len(network.buses) # nodal balance
+
+    for c, hourly in [('Generator', 1), ('Link', 1), ('Store', 2), ('StorageUnit', 3)]:
+        df = network.df(c)
+        if df.empty:
+            continue
+        ext = df.p_nom_extendable if c != 'Store' else df.e_nom_extendable
+        variables += T*hourly*len(df) + ext.sum()
+        # bounds of extendable components are constraints, the rest are
+        # variable bounds
+        constraints += 2*T*hourly*ext.sum()
+
+        if c == 'Generator' and not network.pnl(c)['p_set'].empty:
+            constraints += T*network.pnl(c)['p_set'].shape[1]
+        if c == 'Store':
+            constraints += T*len(df) # energy balance
+        if c == 'StorageUnit':
+            constraints += T*len(df) # state of charge balance
+            inflow = network.pnl(c)['inflow']
+            variables += (inflow > 0).sum().sum() # spillage
+    constraints += len(network.global_constraints)
+
+    return int(variables), int(constraints)
+
+
+def peak_memory():
+    """Peak resident memory in MB of this process and its finished child
+    processes, None on platforms without the resource module (Windows)"""
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and in kB elsewhere
+    return usage/1024**2 if sys.platform == 'darwin' else usage/1024
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Checkpoints of long runs.
+
+run() builds and solves a scenario (see denmark.scenarios) in three stages
+and pickles the result of every stage to a directory named after the
+scenario key:
+
+- data.pkl: df_elec after loading
+- built.pkl: the network after building
+- solved.pkl: the network after solving
+
+With resume=True a run starts from the last stage on disk, so a run that
+died while solving only has to solve again. Pickle is the fastest way to
+write and read back the pandas tables of a network; checkpoints are meant
+for the same code version and environment, not as an archive (see
+denmark.store for that).
+"""
+
+import os
+import pickle
+from urllib.parse import quote
+
+from denmark.bench import timer
+from denmark.scenarios import build, load_data, scenario_key, solve_scenario
+
+stages = ['data', 'built', 'solved']
+
+
+def _path(directory, scenario, stage):
+    return os.path.join(directory, quote(scenario_key(scenario), safe='=,'), '%s.pkl' % stage)
+
+
+def save(obj, path):
+    """Pickle obj to path, replacing the file in one step"""
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'wb') as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + '.tmp', path)
+
+
+def load(path):
+    """Unpickle the object in path"""
+
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def last_stage(directory, scenario):
+    """Last stage of a scenario with a checkpoint, None if there is none"""
+
+    done = [stage for stage in stages if os.path.exists(_path(directory, scenario, stage))]
+    return done[-1] if done else None
+
+
+def _save_network(network, path):
+    # a linopy model is rebuilt when solving again and is not saved
+    model = network.__dict__.pop('model', None)
+    try:
+        save(network, path)
+    finally:
+        if model is not None:
+            network.model = model
+
+
+def run(scenario, directory, resume=True, log=print):
+    """Build and solve a scenario with a checkpoint after every stage.
+    Returns the solved network"""
+
+    timings = {}
+    stage = last_stage(directory, scenario) if resume else None
+    if stage == 'solved':
+        log('%s: solved network from checkpoint' % scenario_key(scenario))
+        return load(_path(directory, scenario, 'solved'))
+
+    if stage == 'built':
+        network = load(_path(directory, scenario, 'built'))
+    else:
+        if stage == 'data':
+            df_elec = load(_path(directory, scenario, 'data'))
+        else:
+            with timer(timings, 'data'):
+                df_elec = load_data(scenario)
+            save(df_elec, _path(directory, scenario, 'data'))
+        with timer(timings, 'built'):
+            network = build(scenario, df_elec)
+        _save_network(network, _path(directory, scenario, 'built'))
+
+    with timer(timings, 'solved'):
+        solve_scenario(network, scenario)
+    _save_network(network, _path(directory, scenario, 'solved'))
+
+    log('%s: resumed after %s, %s' % (scenario_key(scenario), stage or 'nothing',
+                                      ', '.join('%s %.1f s' % item for item in timings.items())))
+    return network
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Compact storage of time series for large multi-zone and multi-year runs.
+
+In compact mode input profiles (p_max_pu, p_set, inflow, ...) and result time
+series (p, e, marginal_price, ...) are held as float32 instead of float64,
+all on the snapshot index of the network, which roughly halves the memory of
+the time series. float32 keeps about 7 significant digits, well below the
+accuracy of the input data.
+
+Use compact=True in the loaders in denmark.data, the builders in
+denmark.models and in denmark.solve.solve.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def downcast(frame):
+    """float64 columns of a DataFrame or Series as float32"""
+
+    if isinstance(frame, pd.Series):
+        return frame.astype(np.float32) if frame.dtype == np.float64 else frame
+    columns = frame.columns[frame.dtypes == np.float64]
+    if len(columns) == len(frame.columns):
+        return frame.astype(np.float32)
+    if len(columns):
+        frame = frame.astype(dict.fromkeys(columns, np.float32))
+    return frame
+
+
+def compact_network(network):
+    """Store all time series of the network as float32 on the snapshot index,
+    in place. Call after building and again after solving"""
+
+    for c in network.iterate_components():
+        for attr, df in c.pnl.items():
+            if df.empty:
+                continue
+            df = downcast(df)
+            df.index = network.snapshots
+            c.pnl[attr] = df
+
+
+def memory_usage(network):
+    """Memory used by the time series of the network in MB, counting the
+    snapshot index once"""
+
+    usage = sum(df.memory_usage(index=False).sum()
+                for c in network.iterate_components()
+                for df in c.pnl.values())
+    return (usage + network.snapshots.memory_usage())/1024**2
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Comparison of stored scenario results (see denmark.store), without building
+or solving any network:
+
+    python -m denmark.compare results/
+    python -m denmark.compare results/ model=co2_h2,co2_limit=null model=co2_h2,co2_limit=590000 --plot
+
+Prints totals, capacity and cost per carrier, full cycles of the storages,
+congestion rent of the interconnectors and the dispatch difference against a reference scenario (the first one
+unless --reference is given).
+Only the columns needed for each table are read.
+"""
+
+import argparse
+
+import pandas as pd
+
+from denmark.store import ResultStore
+
+
+def totals(store, keys):
+    """Objective, cost (€) and emissions (tCO2) per scenario"""
+
+    return store.meta(keys)[['objective', 'cost', 'emissions']]
+
+
+def per_carrier(store, keys, column, zones=True):
+    """A column of the summary per (zone, carrier), or per carrier summed over
+    zones with zones=False, and scenario"""
+
+    df = store.summary(keys, column)
+    return df if zones else df.groupby(level='carrier').sum()
+
+
+def dispatch_difference(store, keys, reference=None):
+    """Difference of the dispatch of every scenario to the reference (first
+    scenario by default): energy difference in MWh and largest hourly
+    difference in MW per (zone, carrier)"""
+
+    reference = keys[0] if reference is None else reference
+    base = store.dispatch(reference)
+    energy = {}
+    peak = {}
+    for key in keys:
+        if key == reference:
+            continue
+        difference = store.dispatch(key).sub(base, fill_value=0.)
+        energy[key] = difference.sum()
+        peak[key] = difference.abs().max()
+    return pd.concat({'energy': pd.DataFrame(energy), 'peak': pd.DataFrame(peak)}, axis=1)
+
+
+def compare(store, keys=None, reference=None):
+    """All comparison tables of the scenarios keys (all stored scenarios by
+    default) as a dict name: DataFrame"""
+
+    keys = store.keys() if keys is None else list(keys)
+    tables = {'totals': totals(store, keys),
+              'capacity': per_carrier(store, keys, 'capacity', zones=False),
+              'cost': per_carrier(store, keys, 'cost', zones=False),
+              'emissions': per_carrier(store, keys, 'emissions'),
+              'storage cycles': store.storage(keys, 'full cycles'),
+              'congestion rent': store.links(keys, 'congestion rent'),
+              }
+    if len(keys) > 1:
+        tables['dispatch difference'] = dispatch_difference(store, keys, reference)
+    return tables
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m denmark.compare',
+                                     description='Compare stored scenario results')
+    parser.add_argument('root', help='directory of the result store')
+    parser.add_argument('keys', nargs='*', help='scenario keys, all stored scenarios if none are given')
+    parser.add_argument('--reference', help='scenario key for the dispatch difference')
+    parser.add_argument('--plot', action='store_true')
+    args = parser.parse_args()
+
+    store = ResultStore(args.root)
+    tables = compare(store, args.keys or None, args.reference)
+    with pd.option_context('display.width', 200, 'display.max_columns', 20):
+        for name, df in tables.items():
+            print('\n%s\n%s' % (name, df))
+
+    if args.plot:
+        from denmark import plots
+        plots.compare(tables)
+        plots.pyplot().show()
+
+
+if __name__ == '__main__':
+    main()
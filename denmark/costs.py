@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""
+Cost assumptions used by the Denmark models.
+"""
+
+
+def annuity(n,r):
+    """Calculate the annuity factor for an asset with lifetime n years and
+    discount rate of r, e.g. annuity(20,0.05)*20 = 1.6"""
+
+    if r > 0:
+        return r/(1. - 1./(1.+r)**n)
+    else:
+        return 1/n
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Loading of the input data in data/.
+
+Reads data for 2017 dowloaded from data.open-power-system-data.org, heat
+demand for 2015 and the daily hydro inflow series per country for 2003-2012.
+Heat demand and inflow are mapped onto the year of the model with
+denmark.remap and cached, so every model reuses the same series.
+"""
+
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+from denmark.remap import remap_year
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def load_elec(filename='2017_entsoe.csv', compact=False):
+    """Load demand and generation for the bidding zones, indexed by UTC time.
+
+    compact=True reads the numbers directly as float32 and leaves out the
+    local time column (see denmark.compact)"""
+
+    path = os.path.join(DATA_DIR, filename)
+    if compact:
+        columns = pd.read_csv(path, sep=',', nrows=0).columns
+        numeric = [c for c in columns[1:] if c != 'cet_cest_timestamp']
+        df_elec = pd.read_csv(path, sep=',', index_col=0, usecols=[columns[0]] + numeric,
+                              dtype=dict.fromkeys(numeric, 'float32')) # in MWh
+    else:
+        df_elec = pd.read_csv(path, sep=',', index_col=0) # in MWh
+    df_elec.index = pd.to_datetime(df_elec.index) #change index to datatime
+    return df_elec
+
+
+def load_topology(zones='zones.csv', links='links.csv'):
+    """Zones outside Denmark and interconnectors of the international model.
+
+    zones has one row per zone with the column prefix of its data in df_elec
+    (data, wind for the wind profile), the space separated technologies
+    (onshorewind, offshorewind, solar, gas), the cost set (see
+    denmark.models.zone_costs) and the installed onshore wind and solar
+    capacity in MW that capacity factors are based on (empty: maximum
+    generation). links has name, bus0, bus1, p_nom (MW) and length (km) of
+    every interconnector, sizes from articles or from
+    transparency.entsoe.eu physical flows"""
+
+    zones = pd.read_csv(os.path.join(DATA_DIR, zones), index_col='zone')
+    links = pd.read_csv(os.path.join(DATA_DIR, links), index_col='name')
+    return zones, links
+
+
+def align(df, snapshots):
+    """Rows of df for the snapshots. Single missing hours, like the last hour
+    of 2017 in 2017_entsoe.csv, are filled with the hour before. df itself
+    if it already has the snapshots as index"""
+
+    if df.index.equals(snapshots):
+        return df
+    return df.reindex(snapshots, method='ffill', limit=1)
+
+
+def zone_name(prefix):
+    """Model zone of a column prefix of the entsoe data, e.g. DK_1 -> dk1"""
+
+    return prefix.replace('_', '').lower()
+
+
+def hours_in(year):
+    """Hourly snapshots of a year in UTC"""
+
+    return pd.date_range('%d-01-01T00:00Z' % year, '%d-12-31T23:00Z' % year, freq='H')
+
+
+@lru_cache()
+def load_heat(year=2017, source_year=2015, align='dayofyear', countries=None, compact=False):
+    """Load hourly heat demand in MWh for source_year and map it onto the
+    hours of year (see denmark.remap). countries is a tuple of country codes
+    to load, e.g. ('DNK',), None for all. compact=True keeps float32.
+
+    The result is cached and shared between all callers, do not modify it in
+    place"""
+
+    path = os.path.join(DATA_DIR, 'heat_demand.csv')
+    columns = pd.read_csv(path, sep=';', nrows=0).columns
+    countries = list(columns[1:]) if countries is None else list(countries)
+    df_heat = pd.read_csv(path, sep=';', index_col=0, usecols=[columns[0]] + countries,
+                          dtype=dict.fromkeys(countries, 'float32') if compact else None)
+    df_heat.index = pd.to_datetime(df_heat.index)
+    return remap_year(df_heat.loc[str(source_year)], hours_in(year), align=align)
+
+
+@lru_cache()
+def _inflow(country, year, source_year, align, compact):
+    inflow = pd.read_csv(os.path.join(DATA_DIR, 'Hydro_Inflow_%s.csv' % country),
+                         sep=',', index_col=False) # in GWh per day
+    inflow.index = pd.to_datetime(inflow[['Year', 'Month', 'Day']])
+    inflow = inflow.loc[str(source_year), 'Inflow']*1000 #GWh to MWh
+    if compact:
+        inflow = inflow.astype('float32')
+    return remap_year(inflow, hours_in(year), align=align, spread=True)
+
+
+def load_inflow(country, regions=1, year=2017, source_year=2011, align='dayofyear', compact=False):
+    """Hourly hydro inflow for a country in MW, from the daily inflow of
+    source_year mapped onto the hours of year (see denmark.remap) and divided
+    equally between the regions of the country. compact=True returns float32"""
+
+    return _inflow(country, year, source_year, align, compact)/regions
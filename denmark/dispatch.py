@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""
+Merit-order dispatch with fixed capacities, without an LP.
+
+For capacities that are already decided (e.g. p_nom_opt of a solved network
+with small changes) the dispatch of the DK models follows a simple merit
+order, computed as array operations over zones x hours x mixes:
+
+1. Wind and solar produce p_max_pu times their capacity.
+2. Surplus of one zone covers deficit of the other over the Great Belt
+   link (and any other link between two zones), up to its capacity.
+3. H2 storage (greedy): surplus in the zone of the electrolysis is stored
+   up to electrolysis and tank capacity, deficit is covered by the fuel
+   cell while the tank is not empty, up to the fuel cell capacity times its
+   efficiency. This is the only step that loops over the hours: compiled
+   with numba if it is installed, otherwise over all mixes of an hour at
+   once. The tank starts at the level it ends with, like e_cyclic in the LP.
+4. OCGT covers the remaining deficit in order of marginal cost, first in
+   its own zone and then over the free capacity of the links.
+5. What is left is unserved energy, valued at voll, and the remaining
+   surplus is curtailed.
+
+simulate() scores many capacity mixes at once, in float32 to halve the
+memory of the zones x hours x mixes arrays. Only extendable capacity counts
+in the capital cost, like in the LP objective. validate() compares the
+dispatch with the LP for the capacities of a solved network.
+"""
+
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+from denmark import results
+
+voll = 10000 # €/MWh, value of lost load for unserved energy
+
+
+def capacities(network):
+    """Optimised capacities of the generators, links (MW) and stores (MWh)"""
+
+    return pd.concat([network.generators.p_nom_opt, network.links.p_nom_opt, network.stores.e_nom_opt])
+
+
+def _system(network):
+    """Arrays of the network needed for the dispatch, time series as float32
+    hours x columns"""
+
+    zones = list(results.zones(network))
+    index = {zone: i for i, zone in enumerate(zones)}
+    generators = network.generators
+    p_max_pu = network.generators_t.p_max_pu
+    variable = [g for g in p_max_pu.columns if generators.bus[g] in index]
+    variable_zone = np.array([index[generators.bus[g]] for g in variable], dtype=int)
+    dispatchable = generators.index[~generators.index.isin(p_max_pu.columns) & generators.bus.isin(zones)]
+    dispatchable = list(generators.loc[dispatchable].sort_values('marginal_cost').index)
+    co2 = generators.carrier.map(network.carriers.co2_emissions).fillna(0.)/generators.efficiency
+
+    links = network.links
+    interconnectors = [l for l in links.index if links.bus0[l] in index and links.bus1[l] in index]
+    storages = []
+    for store, bus in network.stores.bus.items():
+        charge = links.index[(links.bus1 == bus) & links.bus0.isin(zones)]
+        discharge = links.index[(links.bus0 == bus) & links.bus1.isin(zones)]
+        if len(charge) and len(discharge):
+            storages.append({'store': store, 'charge': charge[0], 'discharge': discharge[0],
+                             'zone': index[links.bus0[charge[0]]],
+                             'discharge zone': index[links.bus1[discharge[0]]],
+                             'efficiency charge': links.efficiency[charge[0]],
+                             'efficiency discharge': links.efficiency[discharge[0]]})
+
+    from denmark import duration
+    load = duration.load(network)[zones].fillna(0.).to_numpy(dtype=np.float32)
+    cf = p_max_pu[variable].fillna(0.).to_numpy(dtype=np.float32)
+    return {'zones': zones,
+            'load': [load[:, [z]] for z in range(len(zones))],
+            'variable': variable,
+            'variable zone': variable_zone,
+            'cf': [np.ascontiguousarray(cf[:, variable_zone == z]) for z in range(len(zones))],
+            'cf total': cf.sum(axis=0, dtype=float),
+            'dispatchable': dispatchable,
+            'dispatchable zone': [index[generators.bus[g]] for g in dispatchable],
+            'marginal': generators.marginal_cost[dispatchable].to_numpy(dtype=float),
+            'co2': co2[dispatchable].to_numpy(dtype=float),
+            'interconnectors': [(l, index[links.bus0[l]], index[links.bus1[l]]) for l in interconnectors],
+            'storages': storages}
+
+
+def _exchange(source, sink, capacity, z0, z1, free, back):
+    """Move up to capacity (1 x mixes) from source to sink over a link
+    between z0 and z1 in both directions, in place. free receives the
+    capacity left per hour and mix, back is scratch space of its shape"""
+
+    flow = np.minimum(source[z0], sink[z1], out=free)
+    np.minimum(flow, capacity, out=flow)
+    source[z0] -= flow
+    sink[z1] -= flow
+    np.subtract(capacity, flow, out=free)
+    np.minimum(source[z1], sink[z0], out=back)
+    np.minimum(back, free, out=back)
+    source[z1] -= back
+    sink[z0] -= back
+    free -= back
+
+
+def _storage_loops(surplus, deficit, charge_cap, output_cap, e_nom, eta_c, eta_d, passes):
+    """Greedy storage on hours x mixes arrays in plain loops, only fast when
+    compiled by numba (see _kernel). The mixes of an hour are independent,
+    so the inner loop is vectorised"""
+
+    T, M = surplus.shape
+    # multiplications instead of divisions in the loops
+    in_c, in_d = 1/eta_c, 1/eta_d
+    level = np.zeros(M)
+    charged = np.zeros(M)
+    discharged = np.zeros(M)
+    # the passes before the last only find the level the year ends with
+    for i in range(passes - 1):
+        for t in range(T):
+            for m in range(M):
+                p_in = min(surplus[t, m], charge_cap[m], (e_nom[m] - level[m])*in_c)
+                p_out = min(deficit[t, m], output_cap[m], level[m]*eta_d)
+                level[m] += p_in*eta_c - p_out*in_d
+    for t in range(T):
+        for m in range(M):
+            p_in = min(surplus[t, m], charge_cap[m], (e_nom[m] - level[m])*in_c)
+            p_out = min(deficit[t, m], output_cap[m], level[m]*eta_d)
+            level[m] += p_in*eta_c - p_out*in_d
+            charged[m] += p_in
+            discharged[m] += p_out
+            surplus[t, m] -= p_in
+            deficit[t, m] -= p_out
+    return charged, discharged
+
+
+def _storage_hours(surplus, deficit, charge_cap, output_cap, e_nom, eta_c, eta_d, passes):
+    """Greedy storage on hours x mixes arrays, all mixes of an hour at once"""
+
+    T, M = surplus.shape
+    level = np.zeros(M)
+    p_in = np.empty(M)
+    p_out = np.empty(M)
+    for i in range(passes):
+        last = i == passes - 1
+        charged = np.zeros(M)
+        discharged = np.zeros(M)
+        for t in range(T):
+            np.minimum(np.minimum(surplus[t], charge_cap), (e_nom - level)/eta_c, out=p_in)
+            np.minimum(np.minimum(deficit[t], output_cap), level*eta_d, out=p_out)
+            level += p_in*eta_c - p_out/eta_d
+            charged += p_in
+            discharged += p_out
+            if last:
+                surplus[t] -= p_in
+                deficit[t] -= p_out
+    return charged, discharged
+
+
+# _storage_loops compiled by numba, None without numba
+_compiled = {}
+
+
+def _kernel():
+    """_storage_loops compiled by numba on first use, None if numba is not
+    installed"""
+
+    if 'storage' not in _compiled:
+        if importlib.util.find_spec('numba') is None:
+            _compiled['storage'] = None
+        else:
+            import numba
+            _compiled['storage'] = numba.njit(cache=True)(_storage_loops)
+    return _compiled['storage']
+
+
+def _storage(surplus, deficit, storage, charge_cap, discharge_cap, e_nom, passes=2, compiled=True):
+    """Greedy charging and discharging of one storage, in place on the hours
+    x mixes surplus of its charging zone and deficit of its discharging zone.
+    discharge_cap is the fuel cell capacity on the H2 side, so at most
+    discharge_cap*eta_d reaches the grid. Returns the energy charged and
+    discharged on the grid side per mix. compiled=False always takes the
+    numpy loop over the hours"""
+
+    eta_c, eta_d = storage['efficiency charge'], storage['efficiency discharge']
+    args = (charge_cap.astype(float), discharge_cap.astype(float)*eta_d, e_nom.astype(float),
+            eta_c, eta_d, passes)
+    kernel = (_kernel() if compiled else None) or _storage_hours
+    return kernel(surplus, deficit, *args)
+
+
+def _workspace(system, M):
+    """float32 arrays for batches of up to M mixes, reused by every batch
+    since page faults of new arrays of this size take longer than the
+    operations on them. _simulate takes contiguous views of the size of its
+    batch"""
+
+    T = len(system['load'][0])
+    sizes = {'surplus': len(system['zones']),
+             'deficit': len(system['zones']),
+             'free': len(system['interconnectors']),
+             'spare': len(system['dispatchable']),
+             'scratch': 1}
+    return {key: (n, np.empty(n*T*M, dtype=np.float32)) for key, n in sizes.items()}
+
+
+def _simulate(system, mixes, work, compiled=True):
+    """Dispatch of a batch of mixes, see the module docstring. Surplus and
+    deficit are zones x hours x mixes arrays of the workspace work, changed
+    in place by every step"""
+
+    M = len(mixes)
+    T = len(system['load'][0])
+    # capacities as components x mixes
+    cap = lambda names: mixes.reindex(columns=names, fill_value=0.).to_numpy(dtype=np.float32).T
+    work = {key: values[:n*T*M].reshape(n, T, M) for key, (n, values) in work.items()}
+    surplus, deficit, free, spare = work['surplus'], work['deficit'], work['free'], work['spare']
+    p = work['scratch'][0]
+
+    # 1. wind and solar, one matrix product per zone
+    variable = cap(system['variable'])
+    for z in range(len(deficit)):
+        np.matmul(system['cf'][z], variable[system['variable zone'] == z], out=deficit[z])
+        np.subtract(system['load'][z], deficit[z], out=deficit[z])
+    available = system['cf total'] @ variable.astype(float)
+    np.negative(deficit, out=surplus)
+    np.maximum(surplus, 0, out=surplus)
+    np.maximum(deficit, 0, out=deficit)
+
+    # 2. exchange of surplus over the links
+    for k, (name, z0, z1) in enumerate(system['interconnectors']):
+        _exchange(surplus, deficit, cap([name]), z0, z1, free[k], p)
+
+    # 3. storage
+    charged = np.zeros(M)
+    discharged = np.zeros(M)
+    for storage in system['storages']:
+        c, d = _storage(surplus[storage['zone']], deficit[storage['discharge zone']], storage,
+                        cap([storage['charge']])[0], cap([storage['discharge']])[0],
+                        cap([storage['store']])[0], compiled=compiled)
+        charged += c
+        discharged += d
+
+    # 4. dispatchable generators in merit order, own zone first
+    generation = np.zeros((M, len(system['dispatchable'])))
+    for i, (name, z) in enumerate(zip(system['dispatchable'], system['dispatchable zone'])):
+        capacity = cap([name])
+        np.minimum(deficit[z], capacity, out=p)
+        deficit[z] -= p
+        generation[:, i] = p.sum(axis=0, dtype=float)
+        np.subtract(capacity, p, out=spare[i])
+    for k, (name, z0, z1) in enumerate(system['interconnectors']):
+        for i, z in enumerate(system['dispatchable zone']):
+            if z not in (z0, z1):
+                continue
+            other = z1 if z == z0 else z0
+            np.minimum(deficit[other], spare[i], out=p)
+            np.minimum(p, free[k], out=p)
+            deficit[other] -= p
+            spare[i] -= p
+            free[k] -= p
+            generation[:, i] += p.sum(axis=0, dtype=float)
+
+    # 5. unserved energy and curtailment
+    unserved = deficit.sum(axis=(0, 1), dtype=float)
+    curtailment = surplus.sum(axis=(0, 1), dtype=float)
+    fuel = generation @ system['marginal']
+    df = pd.DataFrame({'fuel cost': fuel,
+                       'unserved cost': voll*unserved,
+                       'dispatchable energy': generation.sum(axis=1),
+                       'renewable energy': available - curtailment,
+                       'curtailment': curtailment,
+                       'unserved energy': unserved,
+                       'storage charged': charged,
+                       'storage discharged': discharged,
+                       'emissions': generation @ system['co2']},
+                      index=mixes.index)
+    return df
+
+
+def simulate(network, mixes=None, batch=256, compiled=True):
+    """Dispatch and cost of capacity mixes. mixes is a DataFrame with one
+    mix per row and component names as columns (capacities in MW, stores in
+    MWh), components missing in mixes keep their p_nom_opt (e_nom_opt). By
+    default the capacities of the solved network. compiled=False runs the
+    storage step in numpy even if numba is installed. Returns cost (€),
+    energy (MWh) and emissions (tCO2) per mix"""
+
+    base = capacities(network)
+    if mixes is None:
+        mixes = base.to_frame().T
+    elif isinstance(mixes, pd.Series):
+        mixes = mixes.to_frame().T
+    mixes = mixes.reindex(columns=base.index).fillna(base)
+
+    system = _system(network)
+    # like the LP objective, only extendable capacity has a capital cost
+    extendable = pd.concat([network.generators.p_nom_extendable, network.links.p_nom_extendable,
+                            network.stores.e_nom_extendable])
+    capital = pd.concat([network.generators.capital_cost, network.links.capital_cost,
+                         network.stores.capital_cost]).where(extendable, 0.)[base.index].to_numpy()
+    work = _workspace(system, min(batch, len(mixes)))
+    frames = [_simulate(system, mixes.iloc[i:i + batch], work, compiled)
+              for i in range(0, len(mixes), batch)]
+    df = pd.concat(frames)
+    df.insert(0, 'capital cost', mixes.to_numpy() @ capital)
+    df.insert(3, 'cost', df['capital cost'] + df['fuel cost'] + df['unserved cost'])
+    return df
+
+
+def validate(network):
+    """Simulated dispatch with the capacities of a solved network against the
+    LP: cost, dispatchable and renewable energy, curtailment and storage.
+    Snapshots are taken as one hour each, like in all DK models"""
+
+    simulated = simulate(network).iloc[0]
+    system = _system(network)
+    p = network.generators_t.p
+    storage_links = [storage['discharge'] for storage in system['storages']]
+    lp = pd.Series({'cost': network.objective,
+                    'dispatchable energy': p[system['dispatchable']].sum().sum(),
+                    'renewable energy': p[system['variable']].sum().sum(),
+                    'curtailment': results.summary(network).curtailment.sum(),
+                    'unserved energy': 0.,
+                    'storage discharged': -network.links_t.p1[storage_links].sum().sum(),
+                    'emissions': p[system['dispatchable']].sum() @ pd.Series(system['co2'], system['dispatchable'])})
+    df = pd.DataFrame({'simulated': simulated[lp.index], 'LP': lp})
+    df['difference'] = df.simulated - df.LP
+    df['relative'] = df.difference/df.LP.where(df.LP != 0)
+    return df
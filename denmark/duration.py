@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Duration curves and residual load for all zones at once.
+
+Every function works on a DataFrame with one column per zone (or any other
+series) and snapshots as index, using sorting and cumulative sums over the
+whole array instead of loops over the zones:
+
+- load(network), residual_load(network) and prices(network) give the zone
+  time series of a solved network (load also before solving).
+- residual_load_inputs(df_elec) gives the residual load straight from the
+  entsoe data, for all zones and years in it, without building a network.
+- duration_curves(df) sorts every column in descending order, per year
+  with by_year=True.
+- hours_above(df, thresholds) and energy_above(df, thresholds) count the
+  hours and the energy (MWh) above each threshold.
+"""
+
+import numpy as np
+import pandas as pd
+
+from denmark import results
+from denmark.data import zone_name
+
+# carriers counted as variable renewables in the residual load
+renewables = ['onshorewind', 'offshorewind', 'solar']
+
+
+def _by_zone(df, zone):
+    """Sum the columns of df per zone, zone maps column to zone"""
+
+    return df.T.groupby(zone[df.columns]).sum().T
+
+
+def load(network, heat=None):
+    """Electricity load per zone in MW, including loads on the electricity
+    buses like the heat loads of the heat model. heat=False leaves out and
+    heat=True keeps only the loads with heat in their name"""
+
+    df = network.loads_t.p if not network.loads_t.p.empty else network.loads_t.p_set
+    if heat is not None:
+        df = df.loc[:, df.columns.str.lower().str.contains('heat') == heat]
+    buses = results.zones(network)
+    df = _by_zone(df, network.loads.bus)
+    return df.reindex(columns=buses, fill_value=0.)
+
+
+def renewable_generation(network):
+    """Wind and solar generation per zone in MW of a solved network"""
+
+    table = results.components(network)
+    names = table.index[(table.component == 'Generator') & table.carrier.isin(renewables)]
+    df = network.generators_t.p[names]
+    return _by_zone(df, table.zone).reindex(columns=results.zones(network), fill_value=0.)
+
+
+def residual_load(network):
+    """Load minus wind and solar generation per zone in MW of a solved
+    network"""
+
+    return load(network) - renewable_generation(network)
+
+
+def prices(network):
+    """Marginal price of electricity per zone in €/MWh"""
+
+    return network.buses_t.marginal_price[results.zones(network)]
+
+
+def residual_load_inputs(df_elec):
+    """Load minus wind and solar generation in MW per zone of the entsoe
+    data, e.g. from load_elec(). Zones are named like in the models (DK_1 ->
+    dk1), zones without wind or solar data have residual load equal to load"""
+
+    parts = df_elec.columns.str.extract(r'^(?P<zone>.+?)_(?P<kind>load_actual_entsoe_transparency|'
+                                        r'wind_onshore_generation_actual|wind_offshore_generation_actual|'
+                                        r'solar_generation_actual)$')
+    parts.index = df_elec.columns
+    parts = parts.dropna()
+    zone = parts.zone.map(zone_name)
+    # generation counts negative
+    sign = np.where(parts.kind == 'load_actual_entsoe_transparency', 1., -1.)
+    df = df_elec[parts.index].fillna(0.)*sign
+    return _by_zone(df, zone)
+
+
+def duration_curves(df, by_year=False):
+    """Every column sorted in descending order, indexed by hours from 1. With
+    by_year=True the columns are (year, column) and shorter years end in NaN"""
+
+    if by_year:
+        years = df.index.year
+        return pd.concat({year: duration_curves(df[years == year]) for year in np.unique(years)},
+                         axis=1)
+    values = -np.sort(-df.to_numpy(dtype=float), axis=0) # NaN last
+    return pd.DataFrame(values, index=pd.RangeIndex(1, len(df) + 1, name='hours'),
+                        columns=df.columns)
+
+
+def hours_above(df, thresholds):
+    """Number of hours above each threshold, thresholds as index and the
+    columns of df as columns"""
+
+    thresholds = np.asarray(thresholds, dtype=float)
+    values = df.to_numpy(dtype=float)
+    counts = (values[None, :, :] > thresholds[:, None, None]).sum(axis=1)
+    return pd.DataFrame(counts, index=pd.Index(thresholds, name='threshold'), columns=df.columns)
+
+
+def energy_above(df, thresholds):
+    """Energy (MWh for hourly MW values) above each threshold, the area
+    between the duration curve and the threshold. thresholds as index and the
+    columns of df as columns"""
+
+    thresholds = np.asarray(thresholds, dtype=float)
+    curves = duration_curves(df).to_numpy()
+    counts = hours_above(df, thresholds).to_numpy()
+    cumulative = np.nancumsum(curves, axis=0)
+    top = np.take_along_axis(cumulative, np.maximum(counts - 1, 0), axis=0)
+    energy = np.where(counts > 0, top - counts*thresholds[:, None], 0.)
+    return pd.DataFrame(energy, index=pd.Index(thresholds, name='threshold'), columns=df.columns)
+
+
+def statistics(df):
+    """Mean, peak, minimum and hours below zero of every column, e.g. the
+    residual load per zone"""
+
+    values = df.to_numpy(dtype=float)
+    return pd.DataFrame({'mean': np.nanmean(values, axis=0),
+                         'peak': np.nanmax(values, axis=0),
+                         'minimum': np.nanmin(values, axis=0),
+                         'hours below zero': (values < 0).sum(axis=0)},
+                        index=df.columns)
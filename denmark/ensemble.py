@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Inflow-year ensemble of the international model.
+
+The inflow files cover 2003-2012, the international model uses 2011 mapped
+onto 2017. ensemble() solves the model once for every inflow year, with the
+2017 load, wind and solar, in parallel worker processes, and returns the
+peak hydro turbine output and reservoir filling and the Danish imports per
+year. spread() summarises them.
+
+df_elec is aligned to the hours of 2017 and put into shared memory once
+(share), every worker wraps it as a read-only DataFrame (attach) instead of
+loading its own copy and only copies the columns a model needs.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+import pandas as pd
+
+from denmark import results
+from denmark.hydro import hydro_dispatch
+from denmark.models import hydro_zones
+
+inflow_years = list(range(2003, 2013))
+
+# df_elec of a worker process, set by _init
+_shared = {}
+
+
+def share(df):
+    """Copy the numbers of df into shared memory. Returns the SharedMemory,
+    to be closed and unlinked by the caller, and the spec for attach"""
+
+    df = df.select_dtypes('number')
+    values = df.to_numpy()
+    memory = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+    np.ndarray(values.shape, values.dtype, buffer=memory.buf)[:] = values
+    return memory, (memory.name, values.shape, values.dtype.str, df.index, df.columns)
+
+
+def attach(spec):
+    """SharedMemory and read-only DataFrame of a spec from share. The
+    DataFrame is only valid while the SharedMemory is open"""
+
+    name, shape, dtype, index, columns = spec
+    memory = shared_memory.SharedMemory(name=name)
+    values = np.ndarray(shape, dtype, buffer=memory.buf)
+    values.flags.writeable = False
+    return memory, pd.DataFrame(values, index=index, columns=columns, copy=False)
+
+
+def _init(spec):
+    _shared['memory'], _shared['df_elec'] = attach(spec)
+
+
+def hydro_sizing(network):
+    """Hydro capacity that is used in every hydro zone, for either hydro
+    representation: peak turbine output (MW) and peak reservoir filling
+    (MWh). p_nom_opt and e_nom_opt are no sizing, as turbine and reservoir
+    cost nothing and the LP can choose any size above what it uses"""
+
+    rows = {}
+    for zone in hydro_zones:
+        name = 'hydro_%s' % zone
+        if name in network.storage_units.index:
+            level = network.storage_units_t.state_of_charge[name]
+        elif '%s Hydro Reservior' % zone in network.stores.index:
+            level = network.stores_t.e['%s Hydro Reservior' % zone]
+        else:
+            continue
+        rows[zone] = (hydro_dispatch(network, zone).max(), level.max())
+    return pd.DataFrame(rows, index=['turbine', 'reservoir']).T
+
+
+def dk_imports(network, zones=('dk1', 'dk2')):
+    """Net import into zones (MWh) over the links from all other buses"""
+
+    links = network.links
+    weightings = results._weightings(network)
+    into = links.index[links.bus1.isin(zones) & ~links.bus0.isin(zones)]
+    out = links.index[links.bus0.isin(zones) & ~links.bus1.isin(zones)]
+    flows = pd.concat([-network.links_t.p1[into], -network.links_t.p0[out]], axis=1)
+    return float(flows.multiply(weightings, axis=0).sum().sum())
+
+
+def _run(inflow_year, hydro_compact, solver_name, backend, threads):
+    from denmark.bench import peak_memory
+    from denmark.models import build_international
+    from denmark.scenarios import solve_scenario
+
+    network = build_international(_shared['df_elec'], hydro_compact=hydro_compact, inflow_year=inflow_year)
+    solve_scenario(network, {'solver': solver_name, 'backend': backend}, threads)
+
+    sizing = hydro_sizing(network)
+    result = {'objective': float(network.objective),
+              'dk imports': dk_imports(network),
+              'peak memory [MB]': peak_memory()}
+    for zone, row in sizing.iterrows():
+        result['%s turbine' % zone] = row.turbine
+        result['%s reservoir' % zone] = row.reservoir
+    return result
+
+
+def ensemble(years=None, processes=None, df_elec=None, hydro_compact=False,
+             solver_name='gurobi', backend='lopf', threads=1):
+    """Solve the international model for every inflow year in years (all of
+    inflow_years by default) in processes worker processes (one per core
+    by default), each solve with threads solver threads. Returns a DataFrame
+    with objective (€), DK net imports (MWh), peak turbine output (MW) and
+    peak reservoir filling (MWh) of the hydro zones per inflow year (see
+    hydro_sizing)"""
+
+    from denmark.data import align, hours_in, load_elec
+
+    years = inflow_years if years is None else list(years)
+    if df_elec is None:
+        df_elec = load_elec()
+    # aligned once here, so the workers only select columns
+    df_elec = align(df_elec, hours_in(2017))
+    processes = processes or min(len(years), os.cpu_count())
+
+    memory, spec = share(df_elec)
+    try:
+        with ProcessPoolExecutor(max_workers=processes, mp_context=get_context('spawn'),
+                                 initializer=_init, initargs=(spec,)) as pool:
+            futures = {year: pool.submit(_run, year, hydro_compact, solver_name, backend, threads)
+                       for year in years}
+            rows = {year: future.result() for year, future in futures.items()}
+    finally:
+        memory.close()
+        memory.unlink()
+    return pd.DataFrame(rows).T.rename_axis('inflow year')
+
+
+def spread(df):
+    """Mean, standard deviation, minimum and maximum of the ensemble results
+    and the range relative to the mean"""
+
+    df = df.drop(columns='peak memory [MB]', errors='ignore')
+    summary = df.agg(['mean', 'std', 'min', 'max']).T
+    summary['range/mean'] = (summary['max'] - summary['min'])/summary['mean'].abs()
+    return summary
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Hydro reservoirs for the international model.
+
+Two representations are available per zone:
+
+- compact=False: the original layout with an inflow generator on its own bus,
+  a link filling the reservoir, a store and a link back to the electricity bus.
+- compact=True: one StorageUnit holding inflow, energy capacity and turbine
+  efficiency. It needs one bus balance per hour instead of three and drops
+  the inflow generator and the two links.
+
+The inflow in the original layout is fixed through p_set, which
+network.optimize enforces and network.lopf ignores, so fix_hydro() adds the
+constraint for lopf. The inflow generator always ends up with p_nom =
+max(inflow) and its capital cost is a constant, capital_cost*max(inflow),
+which the compact unit leaves out of the objective (see fixed_hydro_cost).
+
+p_nom_max limits the fill link of the original layout, i.e. the inflow
+entering the reservoir, not the turbine. The compact unit has no fill link,
+so its inflow is clipped at p_nom_max instead and the turbine is left
+unbounded. In the original layout an inflow above p_nom_max makes the LP
+infeasible.
+
+PyPSA gives a StorageUnit with inflow a spill variable, which the original
+layout does not have. fix_hydro() fixes it to zero; denmark.solve.solve
+calls it for both backends, so both layouts have the same optimum (checked
+by benchmarks/hydro_reservoir.py).
+"""
+
+from denmark.costs import annuity
+
+capital_cost_hydro = annuity(80,0.07)*2000000 # in €/MW
+
+
+def add_hydro(network, zone, inflow, compact=True, efficiency=0.87,
+              p_nom_max=None, max_hours=8760):
+    """Add a hydro reservoir with inflow (in MWh per snapshot) feeding the
+    electricity bus `zone`. efficiency is used both for filling the
+    reservoir and for the turbine. p_nom_max limits the inflow entering the
+    reservoir (MW before the fill efficiency)"""
+
+    if compact:
+        if p_nom_max is not None:
+            inflow = inflow.clip(upper=p_nom_max)
+        network.add("StorageUnit",
+                    "hydro_%s" % zone,
+                    bus=zone,
+                    carrier="hydro_%s" % zone,
+                    p_nom_extendable=True,
+                    p_min_pu=0, # no pumping
+                    max_hours=max_hours, # energy capacity in hours of turbine power
+                    efficiency_dispatch=efficiency,
+                    inflow=inflow*efficiency,
+                    cyclic_state_of_charge=True,
+                    capital_cost=0,
+                    marginal_cost=0)
+        return
+
+    #Create a new carrier
+    network.add("Carrier", "%s_hydro" % zone)
+
+    #Create a new bus
+    network.add("Bus", "%s_hydro" % zone, carrier="%s_hydro" % zone)
+    network.add("Bus", "%s_hydro_inflow" % zone, carrier="%s_hydro" % zone)
+
+    # Hydro Inflow Generator
+    network.add("Generator",
+                "hydro_%s" % zone,
+                bus="%s_hydro_inflow" % zone,
+                carrier="hydro_inflow_%s" % zone,
+                p_nom_extendable=True,
+                p_set=inflow,
+                capital_cost=capital_cost_hydro,
+                marginal_cost=0)
+
+    #Connect the store to the bus
+    network.add("Store",
+                "%s Hydro Reservior" % zone,
+                bus="%s_hydro" % zone,
+                e_nom_extendable=True,
+                e_cyclic=True,
+                capital_cost=0)
+
+    network.add("Link",
+                "Fill reservior %s" % zone,
+                bus0="%s_hydro_inflow" % zone,
+                bus1="%s_hydro" % zone,
+                carrier="hydro_fill_%s" % zone,
+                p_nom_extendable=True,
+                p_nom_max=p_nom_max if p_nom_max is not None else float('inf'),
+                efficiency=efficiency)
+
+    network.add("Link",
+                "Utilize hydro reservior %s" % zone,
+                bus0="%s_hydro" % zone,
+                bus1=zone,
+                carrier="hydro_%s" % zone, # turbine output, same as the compact unit
+                p_nom_extendable=True,
+                efficiency=efficiency,
+                capital_cost=0)
+
+
+def fixed_hydro_cost(network):
+    """Constant inflow generator cost (in €) that the original layout adds to
+    network.objective for the zones built with compact=True"""
+
+    units = [name for name in network.storage_units.index if name.startswith('hydro_')]
+    if not units:
+        return 0.
+    inflow = network.storage_units_t.inflow[units]
+    return capital_cost_hydro*(inflow/network.storage_units.efficiency_dispatch[units]).max().sum()
+
+
+def hydro_dispatch(network, zone):
+    """Electricity delivered by the hydro turbine in `zone` per snapshot,
+    for either representation"""
+
+    name = "hydro_%s" % zone
+    if name in network.storage_units.index:
+        return network.storage_units_t.p[name]
+    return -network.links_t.p1["Utilize hydro reservior %s" % zone]
+
+
+def fix_hydro(network, backend='lopf'):
+    """Fix the spill of the compact hydro units to zero and, for lopf, the
+    inflow generators of the original layout to their p_set, in the model
+    being built, as extra_functionality of network.lopf (backend 'lopf') or
+    after network.optimize.create_model (backend 'linopy')"""
+
+    units = [name for name in network.storage_units.index if name.startswith('hydro_')]
+    if backend == 'linopy':
+        if not units or 'StorageUnit-spill' not in network.model.variables:
+            return
+        variable = network.model.variables['StorageUnit-spill']
+        compact = variable.upper.coords['StorageUnit'].isin(units)
+        variable.upper = variable.upper.where(~compact, 0.)
+        return
+
+    from pypsa.linopt import define_constraints, get_var, linexpr
+
+    if units and ('StorageUnit', 'spill') in network.variables.index:
+        spill = get_var(network, 'StorageUnit', 'spill')
+        spill = spill[spill.columns.intersection(units)]
+        if not spill.empty:
+            define_constraints(network, linexpr((1, spill)), '==', 0., 'StorageUnit', 'no_spill')
+    # network.optimize fixes p to p_set itself, network.lopf ignores p_set
+    inflow = [name for name in network.generators_t.p_set.columns if name.startswith('hydro_')]
+    if inflow:
+        p = get_var(network, 'Generator', 'p')[inflow]
+        define_constraints(network, linexpr((1, p)), '==', network.generators_t.p_set.loc[p.index, inflow],
+                           'Generator', 'inflow')
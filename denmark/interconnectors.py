@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Flows and congestion of the links between electricity zones.
+
+summary(network) gives one row per interconnector (a link with both ends
+on electricity buses, e.g. the Great Belt link and the links of
+data/links.csv) of a solved network:
+
+- p_nom: capacity in MW
+- forward, backward: energy in MWh from bus0 to bus1 and back
+- utilisation: mean absolute flow divided by p_nom
+- congested forward, congested backward: hours at the capacity limit in
+  either direction
+- price spread: mean absolute price difference between the two ends, €/MWh
+- congestion rent: price difference times flow in €, what the link
+  earns from the price difference of its two ends
+
+All links and hours are computed at once as arrays. The table is cached on
+the network and saved with the results of a scenario in denmark.store, so
+net_imports() and rank() also work on stored results.
+"""
+
+import numpy as np
+import pandas as pd
+
+from denmark import results
+
+# flows within this fraction of the limit count as congested
+tolerance = 1e-3
+
+
+def interconnectors(network):
+    """Links with an electricity bus at both ends"""
+
+    links = network.links
+    buses = results.zones(network)
+    return links.index[links.bus0.isin(buses) & links.bus1.isin(buses)]
+
+
+def _summary(network):
+    names = interconnectors(network)
+    links = network.links.loc[names]
+    weightings = results._weightings(network).to_numpy(dtype=float)[:, None]
+    p0 = network.links_t.p0.reindex(columns=names, fill_value=0.).to_numpy(dtype=float)
+    p1 = network.links_t.p1.reindex(columns=names, fill_value=0.).to_numpy(dtype=float)
+    p_nom = links.p_nom_opt.where(links.p_nom_extendable, links.p_nom).to_numpy(dtype=float)
+    prices = network.buses_t.marginal_price
+    price0 = prices.reindex(columns=links.bus0).to_numpy(dtype=float)
+    price1 = prices.reindex(columns=links.bus1).to_numpy(dtype=float)
+
+    p_max_pu = links.p_max_pu.to_numpy(dtype=float)
+    p_min_pu = links.p_min_pu.to_numpy(dtype=float)
+    limit = tolerance*np.maximum(p_nom, 1.)
+    hours = lambda mask: (mask*weightings).sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        utilisation = (np.abs(p0)*weightings).sum(axis=0)/weightings.sum()/p_nom
+    df = pd.DataFrame({'bus0': links.bus0,
+                       'bus1': links.bus1,
+                       'p_nom': p_nom,
+                       'forward': (np.maximum(p0, 0)*weightings).sum(axis=0),
+                       'backward': (np.maximum(-p0, 0)*weightings).sum(axis=0),
+                       'utilisation': np.where(p_nom > 0, utilisation, np.nan),
+                       'congested forward': hours((p0 >= p_max_pu*p_nom - limit) & (p_nom > 0)),
+                       'congested backward': hours((p0 <= p_min_pu*p_nom + limit) & (p_min_pu < 0) & (p_nom > 0)),
+                       'price spread': np.nanmean(np.abs(price1 - price0), axis=0) if len(p0) else np.nan,
+                       # what the link is paid at bus1 minus what it pays at bus0
+                       'congestion rent': np.nansum(-(price1*p1 + price0*p0)*weightings, axis=0)},
+                      index=names)
+    return df.rename_axis('name')
+
+
+def summary(network):
+    """Flow, utilisation, congested hours and congestion rent of every
+    interconnector of a solved network, see the module docstring"""
+
+    return results._cached(network, 'interconnectors', _summary)
+
+
+def net_imports(table):
+    """Net import in MWh per zone from a summary table (of a network or of
+    denmark.store), positive for zones that import more than they export"""
+
+    into = table.forward.groupby(table.bus1).sum().add(table.backward.groupby(table.bus0).sum(), fill_value=0.)
+    out = table.forward.groupby(table.bus0).sum().add(table.backward.groupby(table.bus1).sum(), fill_value=0.)
+    return into.sub(out, fill_value=0.).rename_axis('zone').rename('net import')
+
+
+def rank(store, keys=None, column='congestion rent'):
+    """A column of the interconnector tables of stored scenarios (all by
+    default), links as rows sorted by their mean over the scenarios"""
+
+    keys = store.keys() if keys is None else list(keys)
+    df = store.links(keys, column)
+    return df.loc[df.mean(axis=1).sort_values(ascending=False).index]
@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+"""
+Network builders for the Denmark models.
+
+Each builder returns an unsolved pypsa.Network, so the same model can be
+solved from a script, a benchmark or a batch run without copying the build
+code. Nothing in here imports matplotlib, plots are in denmark/plots.py, and
+pypsa is only imported when the first network is built.
+
+- build_co2_h2: DK1 and DK2 with hydrogen storage and CO2 constraint
+- build_heat: DK1 and DK2 with heat pumps and hydrogen storage
+- build_interannual: DK1 and DK2 for one of the years 2015-2019
+- build_international: DK1 and DK2 connected to NO2, SE3, SE4, DE and NL
+
+All four start from a copy of the same DK1/DK2 network (base_network),
+which is built once per year and input data.
+"""
+
+import json
+import pickle
+
+import pandas as pd
+
+from denmark.compact import compact_network
+from denmark.costs import annuity
+from denmark.data import align, hours_in, load_elec, load_heat, load_inflow, load_topology
+from denmark.hydro import add_hydro
+
+# Installed capacities of DK1 and DK2 in MW, source entsoe.eu. Capacity
+# factors are generation divided by these
+dk_max = {'dk1': {'offshorewind': 843, 'onshorewind': 2966, 'solar': 421},
+          'dk2': {'offshorewind': 428, 'onshorewind': 608, 'solar': 180}}
+
+# Installed capacities for the interannual model
+dk_max_interannual = {2015: dk_max,
+                      2016: dk_max,
+                      2017: dk_max,
+                      2018: {'dk1': {'offshorewind': 1277, 'onshorewind': 3664, 'solar': 664},
+                             'dk2': {'offshorewind': 423, 'onshorewind': 759, 'solar': 338}},
+                      2019: {'dk1': {'offshorewind': 1277, 'onshorewind': 3669, 'solar': 672},
+                             'dk2': {'offshorewind': 423, 'onshorewind': 757, 'solar': 342}}}
+
+# Hydro zones of the international model: inflow file, number of regions the
+# country inflow is divided between and the installed capacity limit
+hydro_zones = {'no2': ('NO', 5, None),
+               'se3': ('NO', 4, None),
+               'se4': ('SE', 4, None),
+               'de': ('DE', 4, 9422)}
+
+
+# Annualised capital costs in €/MW and marginal cost of OCGT in €/MWh_el
+# (fuel cost 21.6 €/MWh_th divided by the efficiency) by cost set. DK1, DK2
+# and the nordic zones of data/zones.csv use the Danish costs, continental
+# zones have higher costs
+zone_costs = {'nordic': {'offshorewind': annuity(30,0.07)*1930000,
+                         'onshorewind': annuity(30,0.07)*1040000,
+                         'solar': annuity(40,0.07)*380000,
+                         'gas': annuity(25,0.07)*560000,
+                         'marginal_gas': 21.6/0.41},
+              'continental': {'offshorewind': annuity(30,0.07)*1930000*(1+0.1),
+                              'onshorewind': annuity(30,0.07)*1040000*(1+0.033),
+                              'solar': annuity(25,0.07)*380000*(1+0.03),
+                              'gas': annuity(25,0.07)*560000*(1+0.033),
+                              'marginal_gas': 21.6/0.39}}
+
+# Columns of df_elec used for DK1 and DK2
+dk_columns = ['%s_%s' % (country, column) for country in ['DK_1', 'DK_2']
+              for column in ['load_actual_entsoe_transparency', 'wind_offshore_generation_actual',
+                             'wind_onshore_generation_actual', 'solar_generation_actual']]
+
+# Pickled DK1/DK2 networks by year, capacities and data, see base_network
+_templates = {}
+
+
+def add_generator(network, name, bus, carrier, capital_cost, marginal_cost=0, p_max_pu=None):
+    """Add an extendable generator, with capacity factor p_max_pu if given"""
+
+    if p_max_pu is None:
+        p_max_pu = 1.
+    network.add("Generator",
+                name,
+                bus=bus,
+                p_nom_extendable=True,
+                carrier=carrier,
+                capital_cost=capital_cost,
+                marginal_cost=marginal_cost,
+                p_max_pu=p_max_pu)
+
+
+def add_link(network, name, bus0, bus1, p_nom, length):
+    """Add a fixed capacity interconnector that can be used in both directions"""
+
+    network.add("Link",
+                name,
+                bus0=bus0,
+                bus1=bus1,
+                p_nom=p_nom, #MW - nominal power passing through link
+                p_min_pu=-1,
+                length=length, # length (in km) between country a and country b
+                capital_cost=400*length) # capital cost * length
+
+
+def new_network(year):
+    """Empty network with the hours of year as snapshots"""
+
+    import pypsa
+
+    network = pypsa.Network()
+    network.set_snapshots(hours_in(year))
+    return network
+
+
+def add_co2_limit(network, co2_limit):
+    """Limit the CO2 emissions (in tonCO2) of all carriers with co2_emissions"""
+
+    network.add("GlobalConstraint",
+                "co2_limit",
+                type="primary_energy",
+                carrier_attribute="co2_emissions",
+                sense="<=",
+                constant=co2_limit)
+
+
+def add_denmark(network, df_elec, maxima=dk_max):
+    """Add DK1 and DK2 with load, offshore and onshore wind, solar PV and
+    OCGT, connected by the Great Belt link. df_elec must cover the snapshots
+    of the network"""
+
+    costs = zone_costs['nordic']
+
+    # only the Danish columns for the snapshots, not a copy of all of df_elec
+    df_elec = align(df_elec[dk_columns], network.snapshots)
+    for zone, country in [('dk1', 'DK_1'), ('dk2', 'DK_2')]:
+        network.add("Carrier", "gas_%s" % zone, co2_emissions=0.19) # in t_CO2/MWh_th
+        network.add("Carrier", "onshorewind_%s" % zone)
+        network.add("Carrier", "offshorewind_%s" % zone)
+        network.add("Carrier", "solar_%s" % zone)
+
+        network.add("Bus", zone)
+        network.add("Load",
+                    "load_%s" % zone,
+                    bus=zone,
+                    p_set=df_elec['%s_load_actual_entsoe_transparency' % country])
+
+        add_generator(network, "offshorewind_%s" % zone, zone, "offshorewind_%s" % zone,
+                      costs['offshorewind'],
+                      p_max_pu=df_elec['%s_wind_offshore_generation_actual' % country]/maxima[zone]['offshorewind'])
+        add_generator(network, "onshorewind_%s" % zone, zone, "onshorewind_%s" % zone,
+                      costs['onshorewind'],
+                      p_max_pu=df_elec['%s_wind_onshore_generation_actual' % country]/maxima[zone]['onshorewind'])
+        add_generator(network, "solar_%s" % zone, zone, "solar_%s" % zone,
+                      costs['solar'],
+                      p_max_pu=df_elec['%s_solar_generation_actual' % country]/maxima[zone]['solar'])
+        # OCGT (Open Cycle Gas Turbine)
+        add_generator(network, "OCGT_%s" % zone, zone, "gas_%s" % zone,
+                      costs['gas'], costs['marginal_gas'])
+
+    add_link(network, 'dk1 - dk2', 'dk1', 'dk2', 600, 58) # Great Belt link
+
+
+def base_network(df_elec, year=2017, maxima=dk_max):
+    """Network for year with DK1 and DK2 (add_denmark). The network is built
+    once per year, capacities and Danish data and kept pickled, every call
+    returns a new copy that can be extended without changing the template"""
+
+    df_elec = align(df_elec[dk_columns], hours_in(year))
+    key = (year, json.dumps(maxima, sort_keys=True),
+           int(pd.util.hash_pandas_object(df_elec).sum()))
+    if key not in _templates:
+        network = new_network(year)
+        add_denmark(network, df_elec, maxima)
+        _templates[key] = pickle.dumps(network, protocol=pickle.HIGHEST_PROTOCOL)
+    return pickle.loads(_templates[key])
+
+
+def add_h2(network, name, h2_bus, bus):
+    """Add a hydrogen tank on its own bus with electrolysis from and fuel
+    cell to the electricity bus `bus`"""
+
+    # Create a new carrier
+    network.add("Carrier", "H2_%s" % name)
+
+    # Create a new bus
+    network.add("Bus", h2_bus, carrier="H2_%s" % name)
+
+    # Connect the store to the bus
+    network.add("Store",
+                "H2 Tank" + ("" if name == 'dk1' else " " + name.upper()),
+                bus=h2_bus,
+                e_nom_extendable=True,
+                e_cyclic=True,
+                capital_cost=annuity(25, 0.07)*57000*(1+0.011))
+
+    # Add the link "H2 Electrolysis" that transports energy from the electricity
+    # bus (bus0) to the H2 bus (bus1) with 80% efficiency
+    suffix = "" if name == 'dk1' else " " + name
+    network.add("Link",
+                "H2 Electrolysis" + suffix,
+                bus0=bus,
+                bus1=h2_bus,
+                p_nom_extendable=True,
+                efficiency=0.8,
+                capital_cost=annuity(25, 0.07)*600000*(1+0.05))
+
+    # Add the link "H2 Fuel Cell" that transports energy from the H2 bus (bus0)
+    # to the electricity bus (bus1) with 58% efficiency
+    network.add("Link",
+                "H2 Fuel Cell" + suffix,
+                bus0=h2_bus,
+                bus1=bus,
+                p_nom_extendable=True,
+                efficiency=0.58,
+                capital_cost=annuity(10, 0.07)*1300000*(1+0.05))
+
+
+def build_co2_h2(df_elec=None, co2_limit=23.6*10**6*0.025, compact=False):
+    """Build DK1 and DK2 for 2017 with hydrogen storage. co2_limit in tonCO2,
+    None for no CO2 constraint. compact=True stores the time series as
+    float32 (see denmark.compact)"""
+
+    if df_elec is None:
+        df_elec = load_elec(compact=compact)
+
+    network = base_network(df_elec)
+    # Both tanks are connected to the DK1 electricity bus
+    add_h2(network, 'dk1', 'H2', 'dk1')
+    add_h2(network, 'dk2', 'H2_bus_dk2', 'dk1')
+
+    if co2_limit is not None:
+        add_co2_limit(network, co2_limit)
+    if compact:
+        compact_network(network)
+
+    return network
+
+
+def build_heat(df_elec=None, df_heat=None, co2_limit=23.6*10**6*0.025, compact=False):
+    """Build DK1 and DK2 for 2017 with heat demand, heat pumps and hydrogen
+    storage. co2_limit in tonCO2, None for no CO2 constraint. compact=True
+    stores the time series as float32 (see denmark.compact)"""
+
+    if df_elec is None:
+        df_elec = load_elec(compact=compact)
+    if df_heat is None:
+        df_heat = load_heat(countries=('DNK',), compact=compact)
+
+    network = base_network(df_elec)
+    network.add("Carrier", "heat")
+
+    # Assume 2/3 of heat is used in DK1 and 1/3 of heat in DK2
+    capital_cost_heatpump = annuity(25,0.07)*1300000 # in €/MW
+    for zone, load, heat_pump, share, carrier in [('dk1', 'Load_heat_dk', 'Heat pump', 2/3, 'heat'),
+                                                  ('dk2', 'Load_heat_dk2', 'Heat pump 2', 1/3, 'heat 2')]:
+        network.add("Bus", "%s heat" % zone, carrier=carrier)
+        network.add("Load",
+                    load,
+                    bus=zone,
+                    p_set=df_heat['DNK'].loc[network.snapshots]*share)
+        network.add("Link",
+                    heat_pump,
+                    bus0=zone,
+                    bus1="%s heat" % zone,
+                    efficiency=3,
+                    capital_cost=capital_cost_heatpump,
+                    p_nom_extendable=True)
+
+    # Both tanks are connected to the DK1 electricity bus
+    add_h2(network, 'dk1', 'H2', 'dk1')
+    add_h2(network, 'dk2', 'H2_bus_dk2', 'dk1')
+
+    if co2_limit is not None:
+        add_co2_limit(network, co2_limit)
+    if compact:
+        compact_network(network)
+
+    return network
+
+
+def build_interannual(df_elec, year, compact=False):
+    """Build DK1 and DK2 for one of the years 2015-2019 with the installed
+    capacities of that year. df_elec covers all years. compact=True stores
+    the time series as float32 (see denmark.compact)"""
+
+    network = base_network(df_elec, year, dk_max_interannual[year])
+    if compact:
+        compact_network(network)
+    return network
+
+
+def add_zone(network, zone, df_elec, data, wind, technologies, costs,
+             onshorewind_max=None, solar_max=None):
+    """Add a zone outside Denmark with load and the generators in
+    technologies, see load_topology in denmark/data.py for the arguments.
+    Emissions outside Denmark are not part of the CO2 limit"""
+
+    network.add("Bus", zone)
+    network.add("Load",
+                "load_%s" % zone,
+                bus=zone,
+                p_set=df_elec['%s_load_actual_entsoe_transparency' % data])
+
+    costs = zone_costs[costs]
+    for technology in technologies.split():
+        network.add("Carrier", "%s_%s" % (technology, zone))
+        if technology == 'gas':
+            add_generator(network, "OCGT_%s" % zone, zone, "gas_%s" % zone,
+                          costs['gas'], costs['marginal_gas'])
+            continue
+        if technology == 'onshorewind':
+            profile = df_elec['%s_wind_onshore_generation_actual' % wind]
+            maximum = onshorewind_max
+        elif technology == 'offshorewind':
+            profile = df_elec['%s_wind_offshore_generation_actual' % data]
+            maximum = None
+        else:
+            profile = df_elec['%s_solar_generation_actual' % data]
+            maximum = solar_max
+        if maximum is None or pd.isna(maximum):
+            maximum = profile.max()
+        add_generator(network, "%s_%s" % (technology, zone), zone, "%s_%s" % (technology, zone),
+                      costs[technology], p_max_pu=profile/maximum)
+
+
+def build_international(df_elec=None, hydro_compact=False, compact=False, zones=None, links=None,
+                        inflow_year=2011):
+    """Build the international connected model of DK1 and DK2 with the zones
+    and interconnectors of data/zones.csv and data/links.csv (NO2, SE3, SE4,
+    DE and NL) for 2017. zones and links can also be given as tables like the
+    ones of load_topology in denmark/data.py. The hydro inflow is the one of
+    inflow_year (2003-2012) mapped onto 2017.
+
+    hydro_compact selects the hydro representation (see denmark.hydro), either
+    for all zones or per zone as a dict, e.g. {'no2': True, 'de': False}.
+    compact=True stores the time series as float32 (see denmark.compact)"""
+
+    if df_elec is None:
+        df_elec = load_elec(compact=compact)
+    if zones is None or links is None:
+        default_zones, default_links = load_topology()
+        zones = default_zones if zones is None else zones
+        links = default_links if links is None else links
+    if not isinstance(hydro_compact, dict):
+        hydro_compact = dict.fromkeys(hydro_zones, hydro_compact)
+
+    network = base_network(df_elec)
+    # only the columns of the zones, e.g. of a DataFrame in shared memory
+    prefixes = tuple('%s_' % prefix for prefix in set(zones.data) | set(zones.wind))
+    df_elec = align(df_elec[[c for c in df_elec.columns if c.startswith(prefixes)]], network.snapshots)
+
+    for zone, row in zones.iterrows():
+        add_zone(network, zone, df_elec, row.data, row.wind, row.technologies, row.costs,
+                 row.get('onshorewind_max'), row.get('solar_max'))
+
+    # Hydro
+    for zone, (country, regions, p_nom_max) in hydro_zones.items():
+        if zone not in network.buses.index:
+            continue
+        add_hydro(network, zone, load_inflow(country, regions, source_year=inflow_year, compact=compact),
+                  compact=hydro_compact.get(zone, False),
+                  p_nom_max=p_nom_max)
+
+    # Links, leaving out links to zones that are not in the model
+    links = links[links.bus0.isin(network.buses.index) & links.bus1.isin(network.buses.index)]
+    for name, row in links.iterrows():
+        add_link(network, name, row.bus0, row.bus1, row.p_nom, row.length)
+
+    if compact:
+        compact_network(network)
+
+    return network
+
+
+# Builders by model name, for batch runs
+builders = {'co2_h2': build_co2_h2,
+            'heat': build_heat,
+            'interannual': build_interannual,
+            'international': build_international}
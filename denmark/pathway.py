@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Myopic investment pathway of the DK models over several periods.
+
+The models are greenfield: every generator, store and H2 link starts from
+zero. pathway() solves one network for the periods in turn (2025, 2030,
+..., 2050 by default), each period only knowing its own CO2 limit:
+
+- capacity built in a period is kept as p_nom_min (e_nom_min) of the
+  following periods until its lifetime has passed. Lifetimes are those of
+  the annuities in denmark/models.py
+- its capital cost stays in the objective as a constant, so the decisions of
+  a period only depend on the cost of new capacity
+- with backend 'linopy' the model is built once and only the capacity
+  bounds and the CO2 limit are changed between the periods. lopf has to
+  write a new LP file for every period
+- with gurobi every period starts from the basis of the previous one, for
+  linopy through a basis file (basis_fn, warmstart_fn), for lopf through
+  store_basis and warmstart
+
+All periods use the weather and load of the network, e.g. 2017.
+"""
+
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from denmark import results
+
+periods = [2025, 2030, 2035, 2040, 2045, 2050]
+
+# lifetime in years by the start of the component name, as in the
+# annuities of denmark/models.py
+lifetimes = {'offshorewind': 30,
+             'onshorewind': 30,
+             'solar': 40,
+             'OCGT': 25,
+             'H2 Tank': 25,
+             'H2 Electrolysis': 25,
+             'H2 Fuel Cell': 10,
+             'Heat pump': 25}
+
+# extendable components and the attributes of their capacity
+_nominal = [('Generator', 'p_nom'), ('Link', 'p_nom'), ('Store', 'e_nom')]
+
+
+def lifetime(name):
+    """Lifetime in years of a component, None if it is never retired"""
+
+    for prefix, years in lifetimes.items():
+        if name.startswith(prefix):
+            return years
+    return None
+
+
+def co2_trajectory(periods=periods, start=23.6*10**6*0.025, end=0.):
+    """CO2 limit in tonCO2 per period, falling linearly from start in the
+    first period to end in the last"""
+
+    first, last = periods[0], periods[-1]
+    return {year: start + (end - start)*(year - first)/max(last - first, 1) for year in periods}
+
+
+def existing(vintages, year):
+    """Capacity of every component built before year and not yet retired.
+    vintages maps the year a capacity was built to a Series of capacity by
+    (component, name)"""
+
+    alive = [capacity[[lifetime(name) is None or built + lifetime(name) > year
+                       for name in capacity.index.get_level_values(-1)]]
+             for built, capacity in vintages.items() if built < year]
+    if not alive:
+        return pd.Series(dtype=float)
+    return pd.concat(alive, axis=1).sum(axis=1)
+
+
+def _capacities(network):
+    return pd.concat({c: network.df(c)['%s_opt' % attr][network.df(c)['%s_extendable' % attr]]
+                      for c, attr in _nominal})
+
+
+def _set_minimum(network, minimum):
+    """Set p_nom_min (e_nom_min) of the network and of its linopy model, if
+    it has one"""
+
+    results.clear_cache(network)
+    model = getattr(network, 'model', None)
+    for c, attr in _nominal:
+        df = network.df(c)
+        names = df.index[df['%s_extendable' % attr]]
+        values = minimum.get(c, pd.Series(dtype=float)).reindex(names, fill_value=0.)
+        df.loc[names, '%s_min' % attr] = values
+        name = '%s-%s' % (c, attr)
+        if model is not None and name in model.variables and len(names):
+            variable = model.variables[name]
+            lower = variable.lower.copy()
+            dim = lower.dims[0]
+            lower.values = values.reindex(lower.indexes[dim]).to_numpy()
+            variable.lower = lower
+
+
+def _set_co2_limit(network, co2_limit):
+    network.global_constraints.loc['co2_limit', 'constant'] = co2_limit
+    results.clear_cache(network)
+    model = getattr(network, 'model', None)
+    if model is not None and 'GlobalConstraint-co2_limit' in model.constraints:
+        model.constraints['GlobalConstraint-co2_limit'].rhs = co2_limit
+
+
+def pathway(network, co2_limits=None, solver_name='gurobi', backend='lopf', solver_options=None,
+            log=print):
+    """Solve the network for the periods of co2_limits (a dict year: limit
+    in tonCO2, co2_trajectory() by default) with brownfield capacity, see
+    the module docstring. The network needs a 'co2_limit' global constraint
+    (build_co2_h2 or build_heat). Returns a dict of DataFrames with
+    components as rows and periods as columns: 'capacity' (p_nom_opt),
+    'new' and 'retired', and 'objective' (€) and 'time' (solve time in s),
+    Series by period"""
+
+    from denmark.solve import solve
+
+    co2_limits = co2_trajectory() if co2_limits is None else co2_limits
+    solver_options = dict(solver_options or {})
+    capacity, new, retired, objective, timings = {}, {}, {}, {}, {}
+    previous = None
+    with tempfile.TemporaryDirectory() as directory:
+        basis_fn = os.path.join(directory, 'basis.bas')
+        for i, (year, co2_limit) in enumerate(sorted(co2_limits.items())):
+            remaining = existing(new, year)
+            _set_minimum(network, {c: remaining.xs(c) for c in remaining.index.unique(0)})
+            _set_co2_limit(network, co2_limit)
+
+            start = time.perf_counter()
+            if backend == 'linopy':
+                basis = {'basis_fn': basis_fn, 'warmstart_fn': basis_fn if i > 0 else None} \
+                    if solver_name == 'gurobi' else {}
+                if i > 0:
+                    network.optimize.solve_model(solver_name=solver_name, io_api='direct', **basis,
+                                                 **solver_options)
+                else:
+                    solve(network, solver_name, backend, solver_options, **basis)
+            elif solver_name == 'gurobi':
+                solve(network, solver_name, backend, solver_options, store_basis=True, warmstart=i > 0)
+            else:
+                solve(network, solver_name, backend, solver_options)
+            timings[year] = time.perf_counter() - start
+
+            built = _capacities(network)
+            new[year] = (built - remaining.reindex(built.index, fill_value=0.)).clip(lower=0.)
+            retired[year] = (previous - remaining.reindex(previous.index, fill_value=0.)).clip(lower=0.) \
+                if previous is not None else pd.Series(0., index=built.index)
+            capacity[year] = built
+            objective[year] = float(network.objective)
+            previous = built
+            if log is not None:
+                log('%d: CO2 limit %.0f t, objective %.3g €, new %.0f MW, retired %.0f MW'
+                    % (year, co2_limit, objective[year], new[year].sum(), retired[year].sum()))
+
+    return {'capacity': pd.DataFrame(capacity),
+            'new': pd.DataFrame(new),
+            'retired': pd.DataFrame(retired),
+            'objective': pd.Series(objective),
+            'time': pd.Series(timings)}
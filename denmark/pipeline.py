@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Pipelined build, solve and report of a batch of scenarios on one machine.
+
+Run one after the other, every scenario loads its data and builds its
+network, waits for the solver and then writes its results and plots, and
+the cores that are not used by the current step stay idle. pipeline()
+overlaps the three steps:
+
+- build: worker processes load the data and build the networks of the next
+  scenarios (at most prefetch ahead) while the current one is solved
+- solve: in this process, one scenario at a time, with all solver threads
+- report: worker processes save the results of finished scenarios to a
+  ResultStore (denmark.store) and plot them
+
+sequential() runs the same steps one after the other, for comparison in
+benchmarks/pipeline.py.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from denmark.scenarios import build, scenario_key, solve_scenario
+
+
+def _build(scenario):
+    start = time.perf_counter()
+    network = build(scenario)
+    return network, time.perf_counter() - start
+
+
+def report(network, key, scenario, store=None, plot_dir=None):
+    """Save the results of a solved network to the result store in the
+    directory store and the generation plot to plot_dir, if given. Returns
+    the time taken in s"""
+
+    start = time.perf_counter()
+    if store is not None:
+        from denmark.store import ResultStore
+        ResultStore(store).save(key, scenario, network)
+    if plot_dir is not None:
+        import matplotlib
+        matplotlib.use('Agg')
+        from denmark import plots
+
+        plt = plots.pyplot()
+        plots.generation_per_type(network)
+        os.makedirs(plot_dir, exist_ok=True)
+        plt.savefig(os.path.join(plot_dir, '%s.png' % key))
+        plt.close('all')
+    return time.perf_counter() - start
+
+
+def _solve(network, scenario, threads):
+    start = time.perf_counter()
+    solve_scenario(network, scenario, threads)
+    # a linopy model is not sent to the report workers
+    network.__dict__.pop('model', None)
+    return time.perf_counter() - start
+
+
+def pipeline(scenarios, store=None, plot_dir=None, prefetch=2, build_workers=1, report_workers=1,
+             threads=None, log=print):
+    """Build, solve and report the scenarios with the steps overlapped, see
+    the module docstring. Returns a dict key: result with objective and
+    build, solve and report time in s"""
+
+    context = get_context('spawn')
+    finished = {}
+    with ProcessPoolExecutor(max_workers=build_workers, mp_context=context) as builders, \
+            ProcessPoolExecutor(max_workers=report_workers, mp_context=context) as reporters:
+        builds = [builders.submit(_build, scenario) for scenario in scenarios[:prefetch]]
+        reports = {}
+        for i, scenario in enumerate(scenarios):
+            network, build_time = builds[i].result()
+            builds[i] = None
+            if i + prefetch < len(scenarios):
+                builds.append(builders.submit(_build, scenarios[i + prefetch]))
+
+            key = scenario_key(scenario)
+            solve_time = _solve(network, scenario, threads)
+            finished[key] = {'objective': float(network.objective),
+                             'build [s]': build_time, 'solve [s]': solve_time}
+            reports[key] = reporters.submit(report, network, key, scenario, store, plot_dir)
+            del network
+            if log is not None:
+                log('%s: solved in %.0f s, %d left' % (key, solve_time, len(scenarios) - i - 1))
+
+        for key, future in reports.items():
+            finished[key]['report [s]'] = future.result()
+    return finished
+
+
+def sequential(scenarios, store=None, plot_dir=None, threads=None, log=print):
+    """Build, solve and report the scenarios one after the other in this
+    process. Returns the same as pipeline"""
+
+    finished = {}
+    for i, scenario in enumerate(scenarios):
+        key = scenario_key(scenario)
+        network, build_time = _build(scenario)
+        solve_time = _solve(network, scenario, threads)
+        finished[key] = {'objective': float(network.objective), 'build [s]': build_time,
+                         'solve [s]': solve_time, 'report [s]': report(network, key, scenario, store, plot_dir)}
+        if log is not None:
+            log('%s: done, %d left' % (key, len(scenarios) - i - 1))
+    return finished
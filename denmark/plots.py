@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Plots for the Denmark scripts.
+
+matplotlib is only imported when the first plot is drawn, so batch runs that
+import the model code never load it.
+"""
+
+import numpy as np
+
+from denmark import results
+
+
+def pyplot():
+    """Import matplotlib.pyplot on first use"""
+
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def generation_week(network, df_elec, start, end):
+    """DK1 generation, H2 storage level and total Danish demand between
+    start and end, e.g. '2017-01-01' and '2017-01-07'"""
+
+    plt = pyplot()
+    generation = results.dispatch(network)
+    plt.figure()
+    plt.plot(network.stores_t.e['H2 Tank'],color='green',label='H2') #H2
+    plt.plot(df_elec.DK_1_load_actual_entsoe_transparency + df_elec.DK_2_load_actual_entsoe_transparency,color='black',label='Demand')
+    plt.plot(generation.dk1.offshorewind,color='royalblue',label='Offshore')
+    plt.plot(generation.dk1.onshorewind,color='blue',label='Onshore')
+    plt.plot(generation.dk1.solar,color='orange',label='Solar')
+    plt.plot(generation.dk1.gas,color='brown',label='Gas')
+    plt.xlim([start],[end])
+    plt.xlabel('Date')
+    plt.ylabel('Generation [MW]')
+    plt.legend()
+
+
+def capacity_factor_averages(cf, title):
+    """Daily, weekly and monthly average of a capacity factor series"""
+
+    plt = pyplot()
+    plt.figure()
+    plt.plot(cf.resample('D').mean(), color='lightskyblue', label='Daily average')
+    plt.plot(cf.resample('M').mean(), color='darkorange',label='Monthly average')
+    plt.plot(cf.resample('W').mean(), color='brown',label='Weekly average')
+    plt.legend()
+    plt.xlabel('Date')
+    plt.ylabel('Capacity factor')
+    plt.title(title)
+
+
+def heat_demand(network):
+    """Weekly average electricity and heat demand of DK1 and DK2"""
+
+    from denmark import duration
+
+    plt = pyplot()
+    elec = duration.load(network, heat=False).resample('W').mean()
+    heat = duration.load(network, heat=True).resample('W').mean()
+    plt.figure()
+    plt.plot(elec.dk1,color='palegreen',label='Electricirty DK1')
+    plt.plot(heat.dk1,color='chocolate',label='Heat DK1')
+    plt.plot(elec.dk2,color='yellowgreen',label='Electricity DK2')
+    plt.plot(heat.dk2,color='sandybrown',label='Heat DK2')
+    plt.xlabel('Time')
+    plt.ylabel('Load [MW]')
+    plt.title('Weekly average electricity and heat demand for 2017')
+    plt.legend()
+
+
+def interannual(capacity, cf):
+    """Average optimal capacity with standard deviation, capacity per year and
+    average capacity factors per year. capacity has years as index and
+    carriers as columns, cf has years as index and (zone, carrier) columns"""
+
+    plt = pyplot()
+    years = list(capacity.index)
+
+    technologies = {'onshorewind': 'Onshore Wind',
+                    'offshorewind': 'Offshore Wind',
+                    'solar': 'Solar',
+                    'gas': 'Gas (OCGT)'}
+    x = list(technologies.values())
+    yval = capacity[list(technologies)].mean()
+    yerr = capacity[list(technologies)].std(ddof=0)
+
+    plt.figure()
+    plt.errorbar(x,yval,yerr=yerr,fmt='o')
+    plt.xlabel('Technology')
+    plt.ylabel('Average Optimal Capacity [MW]')
+    plt.title('Average Optimal Capacity and Standard Deviation for Different\n Technologies in Denmark in the Period %d-%d' % (min(years), max(years)))
+
+    plt.figure()
+    plt.plot(years,capacity.onshorewind,label='Onshore',color='blue')
+    plt.plot(years,capacity.offshorewind,label='Offshore',color='royalblue')
+    plt.plot(years,capacity.solar,label='Solar',color='orange')
+    plt.plot(years,capacity.gas, label='Gas (OCGT)',color='brown')
+    plt.legend(fancybox=True, shadow=True, loc='best')
+    plt.title('Generation Mix as Function of Time')
+    plt.xlabel('Year')
+    plt.ylabel('Installed Capacity [MW]')
+    plt.xticks(np.arange(min(years), max(years)+1, 1.0))
+
+    #Average Capacity Factors
+    plt.figure()
+    plt.plot(years,cf.dk1.offshorewind,label='Offshore DK1')
+    plt.plot(years,cf.dk2.offshorewind, label='Offshore DK2')
+    plt.plot(years,cf.dk1.onshorewind,label='Onshore DK1')
+    plt.plot(years,cf.dk2.onshorewind,label='Onshore DK2')
+    plt.plot(years,cf.dk1.solar, label='Solar DK1')
+    plt.plot(years,cf.dk2.solar, label='Solar DK2')
+    plt.title('Average Capacity Factors')
+    plt.xlabel('Year')
+    plt.ylabel('Capacity Factor')
+    plt.xticks(np.arange(min(years), max(years)+1, 1.0))
+    plt.legend(fancybox=True, shadow=True, loc='best')
+
+
+def demand(network):
+    """Weekly average demand of every zone"""
+
+    from denmark import duration
+
+    plt = pyplot()
+    weekly = duration.load(network).resample('W').mean()
+    plt.figure()
+    for zone, load in weekly.items():
+        plt.plot(load,label=zone.upper())
+    plt.legend()
+    plt.xlabel('Date')
+    plt.ylabel('Demand ( (,) is thousand separator) [MWh]')
+    plt.title('Demand for countries')
+    current_values = plt.gca().get_yticks()
+    plt.gca().set_yticklabels(['{:,.0f}'.format(x) for x in current_values])
+
+
+def generation_per_type(network):
+    """Weekly average generation per zone and carrier"""
+
+    plt = pyplot()
+    labels = {'gas': 'Gas', 'solar': 'Solar', 'offshorewind': 'Offshore',
+              'onshorewind': 'Onshore', 'hydro': 'Hydro'}
+    weekly = results.dispatch(network).resample('W').mean()
+    plt.figure()
+    for (zone, carrier), generation in weekly.items():
+        if carrier in labels:
+            plt.plot(generation, label='%s %s' % (labels[carrier], zone.upper()))
+    plt.legend()
+    plt.xlabel('Date')
+    plt.ylabel('Generation [MW]')
+    plt.title('Generation per type')
+
+
+def compare(tables):
+    """Capacity and cost per carrier and total emissions of several
+    scenarios, from denmark.compare.compare"""
+
+    plt = pyplot()
+    for name, ylabel in [('capacity', 'Capacity [MW]'), ('cost', 'Annualised cost [€]')]:
+        tables[name].T.plot.bar(stacked=True)
+        plt.ylabel(ylabel)
+        plt.title('%s per carrier' % name.capitalize())
+
+    plt.figure()
+    plt.bar(range(len(tables['totals'])), tables['totals'].emissions)
+    plt.xticks(range(len(tables['totals'])), tables['totals'].index, rotation=90)
+    plt.ylabel('Emissions [tCO2]')
+    plt.title('Emissions per scenario')
+
+
+def duration_curves(curves, ylabel, title):
+    """Duration curves from denmark.duration.duration_curves, one line per
+    column"""
+
+    plt = pyplot()
+    plt.figure()
+    for column, curve in curves.items():
+        plt.plot(curve.index, curve, label=column if isinstance(column, str) else ' '.join(map(str, column)))
+    plt.axhline(0, color='black', linewidth=0.5)
+    plt.legend()
+    plt.xlabel('Hours')
+    plt.ylabel(ylabel)
+    plt.title(title)
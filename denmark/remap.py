@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Re-mapping of hourly or daily data from one year onto the snapshots of another.
+
+Shifting the index with DateOffset(years=n) only works between years with the
+same number of days: moving 2015 data to 2016 leaves 29 February empty, and
+moving 2016 data to 2017 drops it and shifts nothing else, so weekdays no
+longer match either. remap_year looks up a source timestamp for every target
+snapshot instead:
+
+- align='dayofyear': same month, day and hour. A target 29 February uses
+  28 February of the source, a source 29 February is not used.
+- align='weekday': the source is moved by whole weeks so weekdays match.
+  Target days before the start or after the end of the source year use the
+  same weekday one week later or earlier. Leap days need no special handling.
+"""
+
+import numpy as np
+import pandas as pd
+
+aligns = ['dayofyear', 'weekday']
+
+
+def _naive(index):
+    """Index without time zone, so source and target can be compared"""
+
+    return index.tz_localize(None) if index.tz is not None else index
+
+
+def remap_year(data, snapshots, align='dayofyear', spread=False):
+    """Map a Series or DataFrame covering one year (hourly or daily values)
+    onto snapshots (hourly) of another year.
+
+    With spread=True daily values are energies that are divided over the 24
+    hours of the day, e.g. inflow in MWh per day to MW. Otherwise daily values
+    are repeated for every hour"""
+
+    if align not in aligns:
+        raise ValueError("align must be one of %s, not %r" % (aligns, align))
+
+    source = _naive(pd.DatetimeIndex(data.index))
+    target = _naive(pd.DatetimeIndex(snapshots))
+    source_year = source[0].year
+    daily = (source == source.normalize()).all() and len(source) <= 366
+
+    if align == 'dayofyear':
+        day = np.asarray(target.day)
+        leap_day = (np.asarray(target.month) == 2) & (day == 29)
+        if not pd.Timestamp(source_year, 1, 1).is_leap_year:
+            day = np.where(leap_day, 28, day)
+        mapped = pd.to_datetime(pd.DataFrame({'year': source_year,
+                                              'month': np.asarray(target.month),
+                                              'day': day,
+                                              'hour': np.asarray(target.hour)}))
+    else:
+        start = pd.Timestamp(source_year, 1, 1)
+        end = pd.Timestamp(source_year + 1, 1, 1)
+        weeks = round((pd.Timestamp(target[0].year, 1, 1) - start).days/7)
+        mapped = target - pd.Timedelta(weeks=weeks)
+        week = pd.Timedelta(weeks=1)
+        mapped = mapped.where(mapped >= start, mapped + week)
+        mapped = mapped.where(mapped < end, mapped - week)
+    mapped = pd.DatetimeIndex(mapped)
+
+    if daily:
+        mapped = mapped.normalize()
+    positions = source.get_indexer(mapped)
+    if (positions < 0).any():
+        missing = mapped[positions < 0].unique()
+        raise ValueError("%d timestamps needed for %d are missing in the source data, first %s"
+                         % (len(missing), target[0].year, missing[0]))
+
+    values = data.to_numpy()[positions]
+    if daily and spread:
+        values = values/24
+
+    if isinstance(data, pd.DataFrame):
+        return pd.DataFrame(values, index=snapshots, columns=data.columns)
+    return pd.Series(values, index=snapshots, name=data.name)
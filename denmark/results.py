@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Results of a solved network aggregated by zone and carrier.
+
+Every Generator, Link, Store and StorageUnit is mapped to a zone (the
+electricity bus it belongs to, e.g. 'dk1') and a carrier without the zone
+suffix (e.g. 'onshorewind' for 'onshorewind_dk1'). summary() and dispatch()
+then aggregate all components in one groupby instead of reading the results
+column by column.
+
+The tables are cached on the network and recomputed when it is solved again
+or its components change. Functions that change inputs of a solved network
+without solving it again call clear_cache().
+"""
+
+import re
+
+import pandas as pd
+
+# attribute holding the optimised capacity of each component
+nominal_attr = {'Generator': 'p_nom',
+                'Link': 'p_nom',
+                'Store': 'e_nom',
+                'StorageUnit': 'p_nom'}
+
+
+def _zone(names, zones):
+    """First of the names, or of their '_' and ' ' separated parts, that is a zone"""
+
+    for name in names:
+        if name in zones:
+            return name
+        for part in re.split('[_ ]', name):
+            if part.lower() in zones:
+                return part.lower()
+    return names[0]
+
+
+def _strip_zone(label, zone):
+    """Remove the zone from a component or carrier name, e.g. gas_dk1 -> gas"""
+
+    sep = ' ' if ' ' in label else '_'
+    parts = [part for part in re.split('[_ ]', label) if part.lower() != zone.lower()]
+    return sep.join(parts) or label
+
+
+def zones(network):
+    """Electricity buses of the network, e.g. dk1, dk2, no2"""
+
+    return network.buses.index[network.buses.carrier.isin(['AC', ''])]
+
+
+def _weightings(network):
+    w = network.snapshot_weightings
+    return w.generators if isinstance(w, pd.DataFrame) else w
+
+
+def clear_cache(network):
+    """Drop the cached tables of the network, after changing it in place"""
+
+    network.results_cache = None
+
+
+def _cached(network, key, func):
+    """Return func(network), cached on the network until it is solved again,
+    components are added or removed or clear_cache() is called"""
+
+    stamp = (getattr(network, 'objective', None), len(network.snapshots),
+             network.snapshots[0] if len(network.snapshots) else None,
+             tuple(len(network.df(c)) for c in nominal_attr))
+    cache = getattr(network, 'results_cache', None)
+    if cache is None or cache.get('stamp') != stamp:
+        cache = network.results_cache = {'stamp': stamp}
+    if key not in cache:
+        cache[key] = func(network)
+    return cache[key]
+
+
+def _components(network):
+    buses = set(zones(network))
+    frames = []
+    for c in nominal_attr:
+        df = network.df(c)
+        if df.empty:
+            continue
+        bus = df.bus0 if c == 'Link' else df.bus
+        table = pd.DataFrame({'component': c}, index=df.index)
+        table['zone'] = [_zone([b, network.buses.carrier.get(b, '')], buses) for b in bus]
+        table['carrier'] = [_strip_zone(carrier or name, zone)
+                            for name, carrier, zone in zip(df.index, df.carrier, table.zone)]
+        if c == 'Link':
+            # links between two zones are interconnectors
+            between = df.bus0.isin(buses) & df.bus1.isin(buses)
+            table.loc[between, 'carrier'] = 'interconnector'
+        frames.append(table)
+    return pd.concat(frames)
+
+
+def components(network):
+    """Table with component type, zone and carrier of every Generator, Link,
+    Store and StorageUnit"""
+
+    return _cached(network, 'components', _components)
+
+
+def _output(network):
+    """Output of every component per snapshot in MW, delivered to its bus
+    (Links: delivered to bus1)"""
+
+    return pd.concat([network.generators_t.p,
+                      -network.links_t.p1,
+                      network.stores_t.p,
+                      network.storage_units_t.p], axis=1)
+
+
+def _summary(network):
+    table = components(network)
+    weightings = _weightings(network)
+    hours = weightings.sum()
+
+    output = _output(network).reindex(columns=table.index, fill_value=0.)
+    energy = output.multiply(weightings, axis=0).sum()
+
+    capacity = pd.concat([network.df(c)[attr + '_opt'] for c, attr in nominal_attr.items()
+                          if not network.df(c).empty])
+    capital_cost = pd.concat([network.df(c).capital_cost for c in nominal_attr
+                              if not network.df(c).empty])
+    marginal_cost = pd.concat([network.df(c).marginal_cost for c in nominal_attr
+                               if not network.df(c).empty])
+
+    # energy available from variable renewables, the rest is curtailed
+    p_max_pu = network.generators_t.p_max_pu
+    available = p_max_pu.multiply(weightings, axis=0).sum()*network.generators.p_nom_opt[p_max_pu.columns]
+    curtailment = (available - energy[p_max_pu.columns]).reindex(table.index, fill_value=0.)
+
+    # emissions of the fuel used by generators
+    generators = network.generators
+    co2 = generators.carrier.map(network.carriers.co2_emissions).fillna(0.)/generators.efficiency
+    emissions = (energy[generators.index]*co2).reindex(table.index, fill_value=0.)
+
+    df = table.assign(energy=energy,
+                      capacity=capacity,
+                      curtailment=curtailment,
+                      capital_cost=capital_cost*capacity,
+                      marginal_cost=marginal_cost*energy.abs(),
+                      emissions=emissions)
+    df = df.groupby(['zone', 'carrier']).sum(numeric_only=True)
+    df['cost'] = df.capital_cost + df.marginal_cost
+    df['capacity_factor'] = df.energy/(df.capacity*hours)
+    return df[['capacity', 'energy', 'curtailment', 'capacity_factor',
+               'capital_cost', 'marginal_cost', 'cost', 'emissions']]
+
+
+def summary(network):
+    """Capacity (MW, MWh for stores), energy (MWh), curtailment (MWh),
+    capacity factor, annualised cost (€) and emissions (tCO2) per zone and
+    carrier.
+
+    Sum over zones with e.g. summary(network).capacity.groupby(level='carrier').sum()"""
+
+    return _cached(network, 'summary', _summary)
+
+
+def _dispatch(network):
+    table = components(network)
+    output = _output(network).reindex(columns=table.index, fill_value=0.)
+    output.columns = pd.MultiIndex.from_frame(table[['zone', 'carrier']])
+    return output.T.groupby(level=['zone', 'carrier']).sum().T
+
+
+def dispatch(network):
+    """Output per snapshot in MW with (zone, carrier) columns"""
+
+    return _cached(network, 'dispatch', _dispatch)
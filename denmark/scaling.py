@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Numerical scaling of the LP by a change of units.
+
+The DK models mix capital costs of ~1e5 €/MW, marginal costs of ~50 €/MWh,
+capacity factors down to 1e-4, loads of thousands of MW and a CO2 limit of
+5.9e5 t in one LP. scale() changes the units of the network before it is
+solved, by default
+
+    MW -> GW, € -> k€, t -> kt
+
+so that capacities, loads, the CO2 limit and the objective come out near 1.
+Costs per MW and emissions per MWh keep their values in these units. The
+network is changed in place and unscale() converts the inputs and results
+back afterwards, so everything after solve(..., scale=True) is in the usual
+units again.
+
+coefficient_ranges() gives the smallest and largest absolute nonzero value
+of the matrix, right-hand side, bounds and objective of the LP, read from
+the network, to compare before and after scaling.
+"""
+
+import numpy as np
+import pandas as pd
+
+from denmark import results
+
+default_factors = {'power': 1e-3, 'money': 1e-3, 'emissions': 1e-3}
+
+# unit of every scaled attribute as exponents of (power, money, emissions):
+# capacities and hourly power in MW, costs in €/MW(h), emissions in t
+_power = (1, 0, 0)
+_cost = (-1, 1, 0)
+_static = {'Generator': {'p_nom': _power, 'p_nom_min': _power, 'p_nom_max': _power, 'p_nom_opt': _power,
+                         'capital_cost': _cost, 'marginal_cost': _cost},
+           'Link': {'p_nom': _power, 'p_nom_min': _power, 'p_nom_max': _power, 'p_nom_opt': _power,
+                    'capital_cost': _cost, 'marginal_cost': _cost},
+           'Store': {'e_nom': _power, 'e_nom_min': _power, 'e_nom_max': _power, 'e_nom_opt': _power,
+                     'e_initial': _power, 'capital_cost': _cost, 'marginal_cost': _cost},
+           'StorageUnit': {'p_nom': _power, 'p_nom_min': _power, 'p_nom_max': _power, 'p_nom_opt': _power,
+                           'state_of_charge_initial': _power, 'capital_cost': _cost, 'marginal_cost': _cost},
+           'Load': {'p_set': _power},
+           'Carrier': {'co2_emissions': (-1, 0, 1)},
+           'GlobalConstraint': {'constant': (0, 0, 1), 'mu': (0, 1, -1)}}
+_series = {'Generator': {'p': _power, 'p_set': _power, 'marginal_cost': _cost},
+           'Link': {'p0': _power, 'p1': _power, 'p2': _power, 'p_set': _power},
+           'Store': {'e': _power, 'p': _power},
+           'StorageUnit': {'p': _power, 'p_dispatch': _power, 'p_store': _power, 'state_of_charge': _power,
+                           'spill': _power, 'inflow': _power},
+           'Load': {'p': _power, 'p_set': _power},
+           'Bus': {'p': _power, 'marginal_price': _cost}}
+
+
+def _factor(unit, factors):
+    return factors['power']**unit[0]*factors['money']**unit[1]*factors['emissions']**unit[2]
+
+
+def _apply(network, factors, inverse=False):
+    for c in set(_static) | set(_series):
+        df = network.df(c)
+        for attr, unit in _static.get(c, {}).items():
+            if attr in df and pd.api.types.is_numeric_dtype(df[attr]):
+                f = _factor(unit, factors)
+                df[attr] = df[attr]/f if inverse else df[attr]*f
+        pnl = network.pnl(c)
+        for attr, unit in _series.get(c, {}).items():
+            if attr in pnl and not pnl[attr].empty:
+                f = _factor(unit, factors)
+                pnl[attr] = pnl[attr]/f if inverse else pnl[attr]*f
+    results.clear_cache(network)
+
+
+def scale(network, factors=None):
+    """Change the units of the network in place, factors maps 'power',
+    'money' and 'emissions' to the number of new units per MW, € and t
+    (default_factors by default). Returns the factors for unscale"""
+
+    factors = dict(default_factors, **(factors or {}))
+    _apply(network, factors)
+    return factors
+
+
+def unscale(network, factors):
+    """Convert the inputs and results of a network scaled with factors back to
+    MW, € and t, including the objective"""
+
+    _apply(network, factors, inverse=True)
+    if getattr(network, 'objective', None) is not None:
+        network.objective = network.objective/factors['money']
+
+
+def _range(values):
+    values = np.abs(np.concatenate([np.asarray(v, dtype=float).ravel() for v in values] or [[]]))
+    values = values[np.isfinite(values) & (values > 0)]
+    if not len(values):
+        return np.nan, np.nan
+    return values.min(), values.max()
+
+
+def coefficient_ranges(network):
+    """Smallest and largest absolute nonzero coefficient of the LP of the
+    network in the matrix (capacity factors, efficiencies, emission
+    factors), the right-hand side (loads, fixed capacities, CO2 limit),
+    the bounds (p_nom_max, e_nom_max) and the objective (capital and
+    marginal costs), with the ratio largest/smallest"""
+
+    generators, links, stores = network.generators, network.links, network.stores
+    carriers = network.carriers.co2_emissions if 'co2_emissions' in network.carriers else pd.Series(dtype=float)
+    emission_factors = generators.carrier.map(carriers).fillna(0.)/generators.efficiency
+
+    parts = {'matrix': [network.generators_t.p_max_pu.to_numpy(), links.efficiency, emission_factors],
+             'rhs': [network.loads_t.p_set.to_numpy(), network.loads.p_set,
+                     generators.p_nom[~generators.p_nom_extendable], links.p_nom[~links.p_nom_extendable],
+                     network.global_constraints.constant],
+             'bounds': [generators.p_nom_max, links.p_nom_max, stores.e_nom_max],
+             'objective': [generators.capital_cost, generators.marginal_cost, links.capital_cost,
+                           links.marginal_cost, stores.capital_cost, stores.marginal_cost]}
+    if not network.storage_units.empty:
+        parts['rhs'].append(network.storage_units_t.inflow.to_numpy())
+        parts['bounds'].append(network.storage_units.p_nom_max)
+        parts['objective'].append(network.storage_units.capital_cost)
+
+    df = pd.DataFrame({name: _range(values) for name, values in parts.items()}, index=['min', 'max']).T
+    df['ratio'] = df['max']/df['min']
+    return df
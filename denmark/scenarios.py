@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Scenarios for batch runs.
+
+A scenario is a dict of plain values naming the model and its options, e.g.
+
+    {'model': 'international', 'hydro_compact': True}
+    {'model': 'interannual', 'year': 2018}
+    {'model': 'co2_h2', 'co2_limit': 590000}
+
+Besides 'model' the keys are arguments of the builder in denmark.models
+('year', 'co2_limit', 'hydro_compact', 'inflow_year', 'compact') and of denmark.solve.solve
+('solver', 'backend'). Scenarios can be stored as JSON, so they can be sent
+to worker processes on other machines.
+"""
+
+import itertools
+import json
+
+# arguments of solve, the rest goes to the builder
+solve_keys = {'solver': 'gurobi', 'backend': 'lopf'}
+
+# data of the interannual model, which covers the years 2015-2019
+interannual_data = 'data/annual_renewable_generation_dk1_dk2.csv'
+
+
+def scenario_key(scenario):
+    """Short unique name of a scenario, e.g. 'model=interannual,year=2018'"""
+
+    items = sorted(scenario.items(), key=lambda item: (item[0] != 'model', item[0]))
+    return ','.join('%s=%s' % (key, json.dumps(value, sort_keys=True).strip('"'))
+                    for key, value in items)
+
+
+def grid(base=None, **axes):
+    """All combinations of the values in axes added to base, e.g.
+    grid({'model': 'co2_h2'}, co2_limit=[None, 590000, 295000])"""
+
+    base = dict(base or {})
+    names = list(axes)
+    return [dict(base, **dict(zip(names, values)))
+            for values in itertools.product(*(axes[name] for name in names))]
+
+
+def load_data(scenario):
+    """Load df_elec for a scenario"""
+
+    from denmark.data import load_elec
+
+    compact = scenario.get('compact', False)
+    if scenario['model'] == 'interannual':
+        return load_elec(interannual_data, compact=compact)
+    return load_elec(compact=compact)
+
+
+def build(scenario, df_elec=None):
+    """Build the network of a scenario, from df_elec if given"""
+
+    from denmark.models import builders
+
+    options = {key: value for key, value in scenario.items()
+               if key != 'model' and key not in solve_keys}
+    model = scenario['model']
+    if model not in builders:
+        raise ValueError("model must be one of %s, not %r" % (sorted(builders), model))
+    if df_elec is None:
+        df_elec = load_data(scenario)
+
+    if model != 'interannual' and options.pop('year', 2017) != 2017:
+        raise ValueError("only the interannual model can be built for other years than 2017")
+    return builders[model](df_elec, **options)
+
+
+# solver option for the number of threads
+thread_options = {'gurobi': 'Threads', 'highs': 'threads', 'cbc': 'threads', 'cplex': 'threads'}
+
+
+def solve_scenario(network, scenario, threads=None):
+    """Solve the network of a scenario with its solver and backend, with at
+    most threads solver threads if given"""
+
+    from denmark.solve import solve
+
+    options = dict(solve_keys)
+    options.update((key, scenario[key]) for key in solve_keys if key in scenario)
+    solver_options = {}
+    if threads is not None and options['solver'] in thread_options:
+        solver_options[thread_options[options['solver']]] = threads
+    solve(network, solver_name=options['solver'], backend=options['backend'],
+          solver_options=solver_options, compact=scenario.get('compact', False))
+
+
+def run(scenario, threads=None):
+    """Build and solve a scenario, with at most threads solver threads if
+    given. Returns the solved network"""
+
+    network = build(scenario)
+    solve_scenario(network, scenario, threads)
+    return network
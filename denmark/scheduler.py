@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Running several scenarios in parallel within a core and memory budget.
+
+Solvers use all cores by default, so several solves started at once slow
+each other down. schedule() gives every job an explicit number of solver
+threads and an estimate of its memory use, and only starts a job when its
+threads and memory are free. Jobs that do not fit are skipped for smaller
+ones further down the list until resources are released.
+
+The memory estimate is a linear function of the LP size (denmark.bench.lp_size)
+of the built network. Calibrate memory_base and memory_per_row with the
+peak memory reported by benchmarks/scheduler.py for other solvers.
+
+Every job runs in a fresh worker process (max_tasks_per_child, Python 3.11
+or later), so the peak memory reported by run_job() is that of the job and
+not of an earlier, larger job in the same process.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import get_context
+
+from denmark.scenarios import scenario_key
+
+memory_base = 400 # MB per job: python, pypsa and the network
+memory_per_row = 2e-3 # MB per LP variable and constraint (LP file and solver)
+
+
+def available_memory():
+    """Free physical memory in MB, None where it cannot be read"""
+
+    try:
+        return os.sysconf('SC_PAGE_SIZE')*os.sysconf('SC_AVPHYS_PAGES')/1024**2
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _size_key(scenario):
+    # LP size does not depend on costs, limits or the solver
+    return (scenario['model'], scenario.get('year', 2017) if scenario['model'] == 'interannual' else None,
+            repr(scenario.get('hydro_compact', False)), scenario.get('compact', False))
+
+
+def estimate_memory(scenarios):
+    """Memory estimate in MB of every scenario, building one network per
+    model and hydro representation"""
+
+    from denmark.bench import lp_size
+    from denmark.scenarios import build
+
+    sizes = {}
+    estimates = []
+    for scenario in scenarios:
+        key = _size_key(scenario)
+        if key not in sizes:
+            sizes[key] = sum(lp_size(build(scenario)))
+        estimates.append(memory_base + memory_per_row*sizes[key])
+    return estimates
+
+
+def run_job(scenario, threads=None):
+    """Build and solve a scenario with threads solver threads. Returns the
+    objective, run time and peak memory. The peak memory is that of the
+    whole process, so run every job in a fresh process"""
+
+    from denmark.bench import peak_memory
+    from denmark.scenarios import run
+
+    start = time.perf_counter()
+    network = run(scenario, threads)
+    return {'objective': float(network.objective),
+            'run time [s]': time.perf_counter() - start,
+            'peak memory [MB]': peak_memory()}
+
+
+def schedule(scenarios, cores=None, memory=None, threads=None, memory_estimates=None, log=print):
+    """Run the scenarios in parallel within cores (all cores by default) and
+    memory (free memory in MB by default), with threads solver threads per
+    job (by default the cores divided between the jobs, at least 1).
+    Returns a dict key: result with objective, run time, peak memory,
+    threads and memory estimate"""
+
+    cores = cores or os.cpu_count()
+    memory = memory or available_memory() or float('inf')
+    threads = threads or max(1, cores//max(1, len(scenarios)))
+    threads = min(threads, cores)
+    if memory_estimates is None:
+        memory_estimates = estimate_memory(scenarios)
+
+    pending = list(zip(scenarios, memory_estimates))
+    running = {}
+    finished = {}
+    free_cores, free_memory = cores, memory
+    with ProcessPoolExecutor(max_workers=max(1, cores//threads), mp_context=get_context('spawn'),
+                             max_tasks_per_child=1) as pool:
+        while pending or running:
+            for job in list(pending):
+                scenario, estimate = job
+                # a job larger than the whole budget runs alone
+                fits = estimate <= free_memory or (not running and estimate > memory)
+                if free_cores >= threads and fits:
+                    pending.remove(job)
+                    future = pool.submit(run_job, scenario, threads)
+                    running[future] = job
+                    free_cores -= threads
+                    free_memory -= estimate
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                scenario, estimate = running.pop(future)
+                free_cores += threads
+                free_memory += estimate
+                key = scenario_key(scenario)
+                result = future.result()
+                result.update({'threads': threads, 'memory estimate [MB]': estimate})
+                finished[key] = result
+                if log is not None:
+                    log('%s: %.0f s, %d left' % (key, result['run time [s]'], len(pending) + len(running)))
+    return finished
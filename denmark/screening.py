@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Screening curves and capacity estimates without solving an LP.
+
+screening_curves() gives the classic annual cost per MW of every technology
+as a function of its full load hours: capital cost (annuity) plus marginal
+cost times hours, with wind and solar limited to the full load hours of
+their capacity factors.
+
+estimate() sizes the technologies of every zone from the hourly load and
+capacity factors: starting from the load, steps of wind and solar capacity
+are added wherever the fuel and OCGT capacity they save is worth more than
+their capital cost, and OCGT covers the peak of the remaining residual load.
+Links, storage and CO2 limits are left out, so this is a quick first
+guess of the mix, not a replacement for the LP; accuracy() shows how far it
+is from p_nom_opt.
+
+prune() removes generators that cannot be part of an optimal solution
+before the LP is built.
+"""
+
+import numpy as np
+import pandas as pd
+
+from denmark import results
+
+renewables = ['offshorewind', 'onshorewind', 'solar']
+
+
+def screening_curves(capital, marginal, full_load_hours=None, hours=None):
+    """Annual cost in €/MW of every technology (columns) running the number
+    of full load hours in the index. capital and marginal are Series by
+    technology in €/MW and €/MWh, full_load_hours (optional) limits the hours
+    of a technology, e.g. the sum of its capacity factor"""
+
+    hours = np.arange(0, 8761, 24) if hours is None else np.asarray(hours)
+    marginal = marginal.reindex(capital.index, fill_value=0.)
+    cost = capital.to_numpy()[None, :] + marginal.to_numpy()[None, :]*hours[:, None]
+    if full_load_hours is not None:
+        limit = full_load_hours.reindex(capital.index, fill_value=np.inf).to_numpy()
+        cost = np.where(hours[:, None] <= limit[None, :], cost, np.nan)
+    return pd.DataFrame(cost, index=pd.Index(hours, name='hours'), columns=capital.index)
+
+
+def estimate(load, profiles, capital, marginal_gas, steps=100):
+    """Capacity estimate in MW per (zone, carrier).
+
+    load is a DataFrame with snapshots as index and zones as columns,
+    profiles a dict carrier: capacity factors like load (missing zones have
+    no such generator), capital a DataFrame of annualised capital costs in
+    €/MW with carriers (including 'gas') as index and zones as columns and
+    marginal_gas the marginal cost of OCGT in €/MWh per zone. Capacity is
+    added in steps of 1/steps of the peak load of a zone"""
+
+    zones = load.columns
+    carriers = [carrier for carrier in profiles if carrier != 'gas']
+    residual = load.fillna(0.).to_numpy(dtype=float)
+    cf = np.stack([profiles[carrier].reindex(index=load.index, columns=zones).fillna(0.).to_numpy(dtype=float)
+                   for carrier in carriers])
+    # carriers that a zone does not have can never be built
+    cost = capital.reindex(index=carriers, columns=zones).fillna(np.inf).to_numpy(dtype=float)
+    cost_gas = capital.loc['gas', zones].to_numpy(dtype=float)
+    marginal = np.broadcast_to(np.asarray(marginal_gas, dtype=float), (len(zones),))
+
+    step = residual.max(axis=0)/steps
+    capacity = np.zeros((len(carriers), len(zones)))
+    zone_index = np.arange(len(zones))
+    for i in range(10*steps):
+        added = cf*step[None, None, :] # MW of every carrier in every zone
+        after = residual[None, :, :] - added
+        # fuel saved on the hours with positive residual load and OCGT
+        # capacity saved at the peak
+        fuel = marginal*(np.maximum(residual, 0).sum(axis=0) - np.maximum(after, 0).sum(axis=1))
+        peak = cost_gas*(residual.max(axis=0) - after.max(axis=1))
+        benefit = fuel + peak - cost*step[None, :]
+        best = benefit.argmax(axis=0)
+        build = benefit[best, zone_index] > 0
+        if not build.any():
+            break
+        capacity[best[build], zone_index[build]] += step[build]
+        residual[:, build] = after[best[build], :, zone_index[build]].T
+
+    df = pd.DataFrame(capacity, index=carriers, columns=zones)
+    df.loc['gas'] = np.maximum(residual.max(axis=0), 0)
+    return df.stack().swaplevel().rename_axis(['zone', 'carrier']).sort_index().rename('capacity')
+
+
+def estimate_denmark(df_elec, maxima=None, costs=None, steps=100):
+    """Capacity estimate for DK1 and DK2 straight from df_elec, with the
+    installed capacities (maxima) and costs of denmark.models"""
+
+    from denmark.models import dk_max, zone_costs
+
+    maxima = dk_max if maxima is None else maxima
+    costs = zone_costs['nordic'] if costs is None else costs
+    zones = {'dk1': 'DK_1', 'dk2': 'DK_2'}
+    columns = {'offshorewind': 'wind_offshore_generation_actual',
+               'onshorewind': 'wind_onshore_generation_actual',
+               'solar': 'solar_generation_actual'}
+
+    load = pd.DataFrame({zone: df_elec['%s_load_actual_entsoe_transparency' % country]
+                         for zone, country in zones.items()})
+    profiles = {carrier: pd.DataFrame({zone: df_elec['%s_%s' % (country, column)]/maxima[zone][carrier]
+                                       for zone, country in zones.items()})
+                for carrier, column in columns.items()}
+    capital = pd.DataFrame({zone: pd.Series({carrier: costs[carrier] for carrier in renewables + ['gas']})
+                            for zone in zones})
+    return estimate(load, profiles, capital, costs['marginal_gas'], steps)
+
+
+def _generators(network):
+    """Generators with zone and carrier"""
+
+    table = results.components(network)
+    return network.generators.assign(zone=table.zone, carrier=table.carrier)
+
+
+def estimate_network(network, steps=100):
+    """Capacity estimate for the zones of a built network, with the capacity
+    factors and costs of its generators"""
+
+    from denmark import duration
+
+    generators = _generators(network)
+    load = duration.load(network)
+    p_max_pu = network.generators_t.p_max_pu
+    variable = generators.loc[p_max_pu.columns]
+    profiles = {carrier: p_max_pu[group.index].T.groupby(group.zone).mean().T
+                for carrier, group in variable.groupby('carrier')}
+    capital = generators.pivot_table(index='carrier', columns='zone', values='capital_cost', aggfunc='mean')
+    capital = capital.reindex(columns=load.columns)
+    gas = generators[generators.carrier == 'gas']
+    marginal_gas = gas.groupby('zone').marginal_cost.mean().reindex(load.columns)
+    # zones without OCGT get the most expensive one
+    capital.loc['gas'] = capital.loc['gas'].fillna(capital.loc['gas'].max())
+    marginal_gas = marginal_gas.fillna(marginal_gas.max())
+    return estimate(load, profiles, capital, marginal_gas.to_numpy(), steps)
+
+
+def prune(network):
+    """Remove wind and solar generators whose capital cost is higher than the
+    most they can earn. At a bus with an extendable OCGT (any dispatchable
+    generator without p_set or p_nom_max) the price is at most its fuel cost
+    plus a capacity rent that adds up to its capital cost, so a generator
+    there earns at most the OCGT fuel cost for all its energy plus the OCGT
+    capital cost at its highest capacity factor. Generators at other buses
+    are kept. Not valid with a CO2 limit, whose price can be higher, so
+    nothing is removed then. Returns the names of the removed generators"""
+
+    if len(network.global_constraints):
+        return []
+    generators = network.generators
+    p_max_pu = network.generators_t.p_max_pu
+    ocgt = generators[~generators.index.isin(p_max_pu.columns)
+                      & ~generators.index.isin(network.generators_t.p_set.columns)
+                      & generators.p_nom_extendable & np.isinf(generators.p_nom_max)]
+    weightings = results._weightings(network)
+    energy = p_max_pu.multiply(weightings, axis=0).sum()
+    peak = p_max_pu.max()
+    bus = generators.bus[p_max_pu.columns]
+    value = pd.Series(np.inf, index=p_max_pu.columns)
+    for name, row in ocgt.iterrows():
+        here = bus == row.bus
+        value[here] = np.minimum(value[here], row.marginal_cost*energy[here] + row.capital_cost*peak[here])
+    names = value.index[(generators.capital_cost[value.index] > value)
+                        & generators.p_nom_extendable[value.index]]
+    network.mremove("Generator", names)
+    results.clear_cache(network)
+    return list(names)
+
+
+def accuracy(capacity, network):
+    """Estimated capacity against p_nom_opt of the solved network per zone
+    and carrier"""
+
+    optimal = results.summary(network).capacity
+    df = pd.DataFrame({'estimate': capacity, 'p_nom_opt': optimal}).dropna(subset=['estimate'])
+    df['p_nom_opt'] = df.p_nom_opt.fillna(0.)
+    df['difference'] = df.estimate - df.p_nom_opt
+    df['ratio'] = df.estimate/df.p_nom_opt.where(df.p_nom_opt > 0)
+    return df
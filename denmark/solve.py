@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Solving the Denmark models.
+
+Two build paths are available:
+
+- 'lopf': network.lopf(pyomo=False), which writes the LP to a file that the
+  solver parses again.
+- 'linopy': network.optimize, which builds an array based linopy model in
+  memory and with io_api='direct' hands it to the solver without text files
+  (supported for gurobi and highs).
+"""
+
+import os
+
+from denmark.compact import compact_network
+from denmark.hydro import fix_hydro
+
+backends = ['lopf', 'linopy']
+
+
+def solve(network, solver_name='gurobi', backend='lopf', solver_options=None,
+          compact=False, scale=False, **kwargs):
+    """Optimise the network with the given backend. compact=True stores the
+    result time series as float32 (see denmark.compact). scale=True (or a
+    dict of factors) solves in GW, k€ and kt and converts the results back
+    (see denmark.scaling). Further keyword arguments are passed on to
+    network.lopf or network.optimize"""
+
+    if solver_options is None:
+        solver_options = {}
+    if scale:
+        from denmark import scaling
+        factors = scaling.scale(network, None if scale is True else scale)
+        try:
+            return solve(network, solver_name, backend, solver_options, compact, **kwargs)
+        finally:
+            scaling.unscale(network, factors)
+
+    if backend not in backends:
+        raise ValueError("backend must be one of %s, not %r" % (backends, backend))
+    kwargs['extra_functionality'] = _extra_functionality(backend, kwargs.get('extra_functionality'))
+    if backend == 'lopf':
+        status = network.lopf(network.snapshots,
+                              pyomo=False,
+                              solver_name=solver_name,
+                              solver_options=solver_options,
+                              **kwargs)
+    else:
+        kwargs.setdefault('io_api', 'direct')
+        status = network.optimize(network.snapshots,
+                                  solver_name=solver_name,
+                                  solver_options=solver_options,
+                                  **kwargs)
+
+    if compact:
+        compact_network(network)
+    return status
+
+
+def _extra_functionality(backend, extra_functionality=None):
+    """extra_functionality for network.lopf and network.optimize: the hydro
+    constraints of denmark.hydro.fix_hydro, then extra_functionality"""
+
+    def constraints(network, snapshots):
+        fix_hydro(network, backend)
+        if extra_functionality is not None:
+            extra_functionality(network, snapshots)
+    return constraints
+
+
+def build_model(network, backend='lopf', keep_file=False):
+    """Only build the optimisation problem, for timing the build step.
+
+    For 'linopy' the model is kept in network.model and can be solved with
+    network.optimize.solve_model. For 'lopf' the LP file is written and
+    removed again unless keep_file, as lopf cannot solve a prepared problem"""
+
+    if backend == 'lopf':
+        from pypsa.linopf import prepare_lopf
+
+        network._multi_invest = 0 # set by network.lopf otherwise
+        fdp, problem_fn = prepare_lopf(network, network.snapshots,
+                                       extra_functionality=_extra_functionality(backend))
+        os.close(fdp)
+        if not keep_file:
+            os.remove(problem_fn)
+        return problem_fn
+    if backend == 'linopy':
+        model = network.optimize.create_model()
+        fix_hydro(network, backend)
+        return model
+    raise ValueError("backend must be one of %s, not %r" % (backends, backend))
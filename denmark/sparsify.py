@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Sparser LPs from capacity factors near zero.
+
+Solar p_max_pu is zero for half of the year and the wind capacity factors
+(measured generation/installed capacity) contain noise values of 1e-4 and
+less. Every such value is a coefficient of the capacity constraint
+
+    p[t] <= p_max_pu[t]*p_nom
+
+of an extendable generator. sparsify() snaps capacity factors below a
+threshold to zero, which removes their coefficients from the matrix with
+both backends. fix_zero_hours() then bounds the dispatch of these hours
+to zero in a linopy model (backend 'linopy', see denmark.solve.build_model),
+so the solver presolve can remove the variables and their constraints as
+well. network.lopf only gets the zeroed values.
+
+nonzeros() counts the matrix entries the solver gets with either backend,
+fixed variables included, as presolve is left to the solver. The objective
+deviation has to come from solving (see benchmarks/sparsify.py).
+"""
+
+import os
+
+import numpy as np
+
+from denmark import results
+
+
+def sparsify(network, threshold=1e-3):
+    """Set p_max_pu of all generators below threshold to zero, in place.
+    Returns the number of values that were changed"""
+
+    p_max_pu = network.generators_t.p_max_pu
+    small = (p_max_pu > 0) & (p_max_pu < threshold)
+    network.generators_t.p_max_pu = p_max_pu.mask(small, 0.)
+    results.clear_cache(network)
+    return int(small.sum().sum())
+
+
+def fix_zero_hours(network):
+    """Bound the dispatch of every generator to zero in the hours where its
+    p_max_pu is zero, in the linopy model network.model. Returns the number
+    of fixed variables"""
+
+    p_max_pu = network.generators_t.p_max_pu
+    variable = network.model.variables['Generator-p']
+    zero = (p_max_pu == 0).reindex(index=network.snapshots, fill_value=False)
+    zero = zero.rename_axis(index='snapshot', columns='Generator')
+    mask = zero.stack().to_xarray().reindex_like(variable.labels, fill_value=False)
+    variable.upper = variable.upper.where(~mask, 0.)
+    variable.lower = variable.lower.where(~mask, 0.)
+    return int(mask.sum())
+
+
+def nonzeros(network, backend='linopy'):
+    """Number of nonzero entries of the constraint matrix the solver gets.
+    For 'linopy' of network.model, built if the network has none yet, for
+    'lopf' counted in the LP file, which is written and removed again"""
+
+    from denmark.solve import build_model
+
+    if backend == 'lopf':
+        problem_fn = build_model(network, backend='lopf', keep_file=True)
+        try:
+            return _lp_nonzeros(problem_fn)
+        finally:
+            os.remove(problem_fn)
+    model = getattr(network, 'model', None)
+    if model is None:
+        model = build_model(network, backend='linopy')
+    return int(np.count_nonzero(model.matrices.A.data))
+
+
+def _lp_nonzeros(problem_fn):
+    """Nonzero coefficients in the constraints of an LP file written by
+    network.lopf, one '+1.000000 x12' term per line"""
+
+    count = 0
+    constraints = False
+    with open(problem_fn) as f:
+        for line in f:
+            if line.startswith('s.t.'):
+                constraints = True
+            elif line.startswith('bounds'):
+                break
+            elif constraints and line[:1] in '+-':
+                term = line.split()
+                if len(term) == 2 and term[1][0] == 'x' and float(term[0]) != 0:
+                    count += 1
+    return count
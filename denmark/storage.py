@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Cycling and state of charge of the storages of a solved network.
+
+Every Store (H2 tanks, hydro reservoirs of the original layout) and every
+StorageUnit (compact hydro reservoirs) is one column of an energy level
+matrix, so all statistics are computed for all storages at once. Charging
+and discharging of a Store is done by the links into and out of its bus
+(H2 Electrolysis and H2 Fuel Cell, Fill reservior and Utilize hydro
+reservior); they are counted on the grid side so the round-trip losses
+include the conversion losses of the links.
+
+summary(network) and fill_profile(network) are cached on the network like
+the tables of denmark.results and saved with the results of a scenario in
+denmark.store.
+"""
+
+import numpy as np
+import pandas as pd
+
+from denmark import results
+
+
+def _levels(network):
+    """Energy level per snapshot and energy capacity of every storage in MWh"""
+
+    units = network.storage_units
+    levels = pd.concat([network.stores_t.e, network.storage_units_t.state_of_charge], axis=1)
+    capacity = pd.concat([network.stores.e_nom_opt, units.p_nom_opt*units.max_hours])
+    return levels, capacity[levels.columns]
+
+
+def _flows(network):
+    """Energy charged from and discharged to the grid, inflow and spillage
+    of every storage in MWh"""
+
+    weightings = results._weightings(network)
+    links = network.links
+    stores = network.stores
+    units = network.storage_units
+
+    def total(df):
+        return df.multiply(weightings, axis=0).sum() if not df.empty else pd.Series(dtype=float)
+
+    # links into the bus of a store charge it, links out of it discharge it
+    charged_bus = total(network.links_t.p0).reindex(links.index, fill_value=0.).groupby(links.bus1).sum()
+    discharged_bus = -total(network.links_t.p1).reindex(links.index, fill_value=0.).groupby(links.bus0).sum()
+    zero_stores = pd.Series(0., index=stores.index)
+
+    def unit_total(attr):
+        return total(network.storage_units_t[attr]).reindex(units.index, fill_value=0.)
+
+    return pd.DataFrame({'charged': pd.concat([stores.bus.map(charged_bus).fillna(0.),
+                                               unit_total('p_store')]),
+                         'discharged': pd.concat([stores.bus.map(discharged_bus).fillna(0.),
+                                                  unit_total('p_dispatch')]),
+                         'inflow': pd.concat([zero_stores, unit_total('inflow')]),
+                         'spill': pd.concat([zero_stores, unit_total('spill')])})
+
+
+def _mean_run(active):
+    """Mean length in snapshots of the runs of True in every column"""
+
+    starts = active & ~np.vstack([np.zeros((1, active.shape[1]), dtype=bool), active[:-1]])
+    n = starts.sum(axis=0)
+    return np.where(n > 0, active.sum(axis=0)/np.maximum(n, 1), 0.)
+
+
+def _summary(network):
+    levels, capacity = _levels(network)
+    flows = _flows(network).loc[levels.columns]
+    values = levels.to_numpy(dtype=float)
+    change = np.diff(values, axis=0)
+    tolerance = 1e-3*np.maximum(capacity.to_numpy(), 1.)
+    charging = change > tolerance
+    discharging = change < -tolerance
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stored = flows.charged + flows.inflow - flows.spill - (values[-1] - values[0])
+        df = pd.DataFrame({'energy capacity': capacity,
+                           'charged': flows.charged,
+                           'discharged': flows.discharged,
+                           'inflow': flows.inflow,
+                           'spill': flows.spill,
+                           # level decrease over the year in units of the capacity
+                           'full cycles': np.where(discharging, -change, 0.).sum(axis=0)/capacity,
+                           'charging hours': charging.sum(axis=0),
+                           'discharging hours': discharging.sum(axis=0),
+                           'mean charge duration': _mean_run(charging),
+                           'mean discharge duration': _mean_run(discharging),
+                           'losses': stored - flows.discharged,
+                           'round-trip efficiency': flows.discharged/stored,
+                           'mean utilisation': values.mean(axis=0)/capacity,
+                           'peak utilisation': values.max(axis=0)/capacity},
+                          index=levels.columns)
+    table = results.components(network).loc[levels.columns, ['component', 'zone', 'carrier']]
+    return pd.concat([table, df.replace([np.inf, -np.inf], np.nan)], axis=1)
+
+
+def summary(network):
+    """Cycling of every Store and StorageUnit: energy capacity, energy
+    charged, discharged, inflow and spillage (MWh), equivalent full cycles,
+    hours and mean duration (h) of charging and discharging, round-trip
+    losses (MWh) and efficiency and mean and peak utilisation of the energy
+    capacity"""
+
+    return results._cached(network, 'storage', _summary)
+
+
+def _fill_profile(network):
+    levels, capacity = _levels(network)
+    fill = levels/capacity.where(capacity > 0)
+    return fill.groupby(fill.index.month).mean().rename_axis('month')
+
+
+def fill_profile(network):
+    """Monthly mean state of charge of every storage as share of its energy
+    capacity, months as index"""
+
+    return results._cached(network, 'fill_profile', _fill_profile)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar store of scenario results.
+
+Every solved scenario is saved as parquet files in a directory named
+after its scenario key (see denmark.scenarios):
+
+- meta.parquet: scenario, objective, total cost and emissions, one row
+- summary.parquet: results.summary with zone and carrier as columns
+- dispatch.parquet: results.dispatch, one column per 'zone carrier'
+- storage.parquet: storage.summary, one row per Store and StorageUnit
+- fill.parquet: storage.fill_profile, one column per storage
+- prices.parquet: marginal price per zone, for denmark.backtest
+- links.parquet: interconnectors.summary, one row per interconnector
+
+Parquet stores every column separately, so tables for many scenarios can be
+read column by column without loading the rest or rebuilding a network.
+Writing parquet needs pyarrow (or fastparquet) in addition to pandas.
+"""
+
+import json
+import os
+from urllib.parse import quote, unquote
+
+import pandas as pd
+
+tables = ['meta', 'summary', 'dispatch', 'storage', 'fill', 'prices', 'links', 'backtest']
+
+
+def _flat(columns):
+    return ['%s %s' % (zone, carrier) for zone, carrier in columns]
+
+
+class ResultStore:
+    """Results of solved scenarios in the directory root"""
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key, table):
+        return os.path.join(self.root, quote(key, safe='=,'), '%s.parquet' % table)
+
+    def keys(self):
+        """Keys of all stored scenarios"""
+
+        return sorted(unquote(name) for name in os.listdir(self.root)
+                      if os.path.exists(os.path.join(self.root, name, 'meta.parquet')))
+
+    def __contains__(self, key):
+        return self.has(key, 'meta')
+
+    def save(self, key, scenario, network):
+        """Save the results of a solved network under key. meta is written
+        last, so a scenario is only listed once all its tables are complete"""
+
+        from denmark import duration, interconnectors, results, storage
+
+        summary = results.summary(network)
+        dispatch = results.dispatch(network).copy()
+        dispatch.columns = _flat(dispatch.columns)
+        meta = pd.DataFrame({'key': [key],
+                             'scenario': [json.dumps(scenario, sort_keys=True)],
+                             'objective': [float(network.objective)],
+                             'cost': [summary.cost.sum()],
+                             'emissions': [summary.emissions.sum()]})
+
+        frames = [('summary', summary.reset_index()),
+                  ('dispatch', dispatch),
+                  ('storage', storage.summary(network).rename_axis('name').reset_index()),
+                  ('fill', storage.fill_profile(network)),
+                  ('prices', duration.prices(network)),
+                  ('links', interconnectors.summary(network).reset_index()),
+                  ('meta', meta)]
+        # a backtest of earlier results is out of date
+        if self.has(key, 'backtest'):
+            os.remove(self._path(key, 'backtest'))
+        for table, df in frames:
+            self.write(key, table, df)
+
+    def write(self, key, table, df):
+        """Write one table of a scenario, replacing the file in one step"""
+
+        if table not in tables:
+            raise ValueError("table must be one of %s, not %r" % (tables, table))
+        path = self._path(key, table)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_parquet(path + '.tmp')
+        os.replace(path + '.tmp', path)
+
+    def has(self, key, table):
+        """Whether the table of a scenario has been written"""
+
+        return os.path.exists(self._path(key, table))
+
+    def read(self, key, table, columns=None):
+        """One table of a scenario, only the given columns"""
+
+        if table not in tables:
+            raise ValueError("table must be one of %s, not %r" % (tables, table))
+        if key not in self:
+            raise KeyError("no results for scenario %r in %s" % (key, self.root))
+        return pd.read_parquet(self._path(key, table), columns=columns)
+
+    def summary(self, keys, column):
+        """One column of the summary for several scenarios, with (zone,
+        carrier) as index and the scenario keys as columns"""
+
+        return pd.DataFrame({key: self.read(key, 'summary', ['zone', 'carrier', column])
+                                      .set_index(['zone', 'carrier'])[column]
+                             for key in keys})
+
+    def dispatch(self, key, columns=None):
+        """Dispatch of a scenario with (zone, carrier) columns. columns is a
+        list of (zone, carrier) to read, None for all"""
+
+        df = self.read(key, 'dispatch', None if columns is None else _flat(columns))
+        df.columns = pd.MultiIndex.from_tuples([tuple(c.split(' ', 1)) for c in df.columns],
+                                               names=['zone', 'carrier'])
+        return df
+
+    def storage(self, keys, column):
+        """One column of the storage summary for several scenarios, with the
+        storage names as index and the scenario keys as columns"""
+
+        return pd.DataFrame({key: self.read(key, 'storage', ['name', column]).set_index('name')[column]
+                             for key in keys})
+
+    def links(self, keys, column):
+        """One column of the interconnector table for several scenarios, with
+        the link names as index and the scenario keys as columns"""
+
+        return pd.DataFrame({key: self.read(key, 'links', ['name', column]).set_index('name')[column]
+                             for key in keys})
+
+    def meta(self, keys):
+        """Objective, cost and emissions of several scenarios, one row each"""
+
+        return pd.concat([self.read(key, 'meta') for key in keys]).set_index('key')
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Surrogate model of the solved scenarios in a result store.
+
+Surrogate learns the map from the parameters of a scenario (the numeric
+keys of its dict, e.g. co2_limit, year, inflow_year, and one column per
+model) to its system cost and p_nom_opt per zone and carrier, from the
+tables of denmark.store. Predictions take milliseconds and come with a
+standard deviation, so propose() can pick the candidate scenarios the model
+is least sure about as the next ones to solve.
+
+Three regression methods:
+
+- 'gp': Gaussian process (scikit-learn), standard deviation from the
+  posterior
+- 'gbr': gradient boosting (scikit-learn), standard deviation from the 10%
+  and 90% quantile models
+- 'knn': inverse distance weighting of the k nearest solved scenarios,
+  standard deviation of their values, numpy only
+
+scikit-learn is optional, without it the default method is 'knn'.
+"""
+
+import importlib.util
+import json
+
+import numpy as np
+import pandas as pd
+
+
+def _sklearn():
+    """Whether scikit-learn is installed"""
+
+    return importlib.util.find_spec('sklearn') is not None
+
+
+def features(scenarios):
+    """Parameters of the scenarios as a DataFrame, one row per scenario.
+    Booleans become 0/1, 'model' one column per model, None (e.g. no CO2
+    limit) and other values missing"""
+
+    rows = []
+    for scenario in scenarios:
+        row = {}
+        for key, value in scenario.items():
+            if key == 'model':
+                row['model=%s' % value] = 1.
+            elif isinstance(value, (bool, int, float)):
+                row[key] = float(value)
+            elif value is None:
+                row[key] = np.nan
+        rows.append(row)
+    df = pd.DataFrame(rows)
+    models = [c for c in df.columns if c.startswith('model=')]
+    df[models] = df[models].fillna(0.)
+    return df
+
+
+def training_data(store, keys=None):
+    """Features and targets of stored scenarios (all by default): cost (€)
+    and capacity (MW, MWh for stores) per 'zone carrier'"""
+
+    keys = store.keys() if keys is None else list(keys)
+    meta = store.meta(keys)
+    scenarios = [json.loads(s) for s in meta.scenario]
+    capacity = store.summary(keys, 'capacity').T
+    capacity.columns = ['capacity %s %s' % column for column in capacity.columns]
+    targets = pd.concat([meta[['cost']], capacity.fillna(0.)], axis=1).loc[keys]
+    X = features(scenarios)
+    X.index = keys
+    return X, targets
+
+
+class Surrogate:
+    """Regression of targets on scenario features, see the module docstring"""
+
+    def __init__(self, method=None, neighbours=5):
+        self.method = method or ('gp' if _sklearn() else 'knn')
+        if self.method not in ('gp', 'gbr', 'knn'):
+            raise ValueError("method must be one of ['gp', 'gbr', 'knn'], not %r" % self.method)
+        if self.method != 'knn' and not _sklearn():
+            raise ImportError("method %r needs scikit-learn" % self.method)
+        self.neighbours = neighbours
+
+    def _scale(self, X):
+        X = X.reindex(columns=self.columns)
+        # a model the scenario is not of, also one unseen in the scenarios
+        models = [c for c in self.columns if c.startswith('model=')]
+        X[models] = X[models].fillna(0.)
+        # missing parameters (no CO2 limit) lie beyond the largest solved value
+        X = X.fillna(self.fill)
+        X = X.fillna(0.)
+        return ((X - self.mean)/self.std).to_numpy(dtype=float)
+
+    def fit(self, X, targets):
+        """Train on features X and targets (DataFrames with one row per
+        scenario). Returns self"""
+
+        self.columns = X.columns
+        self.fill = 2*X.max().abs()
+        filled = X.fillna(self.fill).fillna(0.)
+        self.mean = filled.mean()
+        self.std = filled.std().replace(0., 1.).fillna(1.)
+        self.targets = targets.columns
+        self.X = self._scale(X)
+        self.Y = targets.to_numpy(dtype=float)
+        self.y_mean = self.Y.mean(axis=0)
+        self.y_std = np.where(self.Y.std(axis=0) > 0, self.Y.std(axis=0), 1.)
+        Y = (self.Y - self.y_mean)/self.y_std
+
+        if self.method == 'gp':
+            from sklearn.gaussian_process import GaussianProcessRegressor
+            from sklearn.gaussian_process.kernels import Matern, WhiteKernel
+
+            kernel = Matern(length_scale=np.ones(self.X.shape[1]), nu=2.5) + WhiteKernel(1e-3)
+            self.models = [GaussianProcessRegressor(kernel, normalize_y=False, n_restarts_optimizer=2,
+                                                    random_state=0).fit(self.X, Y)]
+        elif self.method == 'gbr':
+            from sklearn.ensemble import GradientBoostingRegressor
+
+            self.models = [[GradientBoostingRegressor(loss=loss, alpha=alpha, random_state=0).fit(self.X, y)
+                            for loss, alpha in [('squared_error', 0.9), ('quantile', 0.1), ('quantile', 0.9)]]
+                           for y in Y.T]
+        return self
+
+    def predict(self, X):
+        """Mean and standard deviation of every target for features X, as
+        two DataFrames"""
+
+        Xs = self._scale(X)
+        if self.method == 'gp':
+            mean, std = self.models[0].predict(Xs, return_std=True)
+            std = std.reshape(len(Xs), -1)
+            if std.shape[1] == 1:
+                std = np.repeat(std, len(self.targets), axis=1)
+        elif self.method == 'gbr':
+            predictions = np.array([[model.predict(Xs) for model in models] for models in self.models])
+            mean = predictions[:, 0].T
+            # 10% to 90% of a normal distribution is 2.56 standard deviations
+            std = np.abs(predictions[:, 2] - predictions[:, 1]).T/2.56
+        else:
+            distance = np.sqrt(((Xs[:, None, :] - self.X[None, :, :])**2).sum(axis=2))
+            nearest = np.argsort(distance, axis=1)[:, :self.neighbours]
+            d = np.take_along_axis(distance, nearest, axis=1)
+            weights = 1/np.maximum(d, 1e-9)**2
+            weights /= weights.sum(axis=1, keepdims=True)
+            Y = (self.Y - self.y_mean)/self.y_std
+            values = Y[nearest]
+            mean = (weights[:, :, None]*values).sum(axis=1)
+            std = np.sqrt((weights[:, :, None]*(values - mean[:, None, :])**2).sum(axis=1))
+            # further away from all solved scenarios is less certain
+            std = std + d.min(axis=1, keepdims=True)*values.std(axis=1)
+        index = X.index
+        return (pd.DataFrame(mean*self.y_std + self.y_mean, index=index, columns=self.targets),
+                pd.DataFrame(std*self.y_std, index=index, columns=self.targets))
+
+    def query(self, scenarios):
+        """Mean and standard deviation for a list of scenario dicts"""
+
+        return self.predict(features(scenarios))
+
+    def propose(self, candidates, n=5, target='cost'):
+        """The n candidate scenarios (a list of dicts, e.g. from
+        denmark.scenarios.grid) with the largest standard deviation of
+        target, spread out: the uncertainty of a candidate is discounted by
+        its distance to the ones already picked"""
+
+        X = features(candidates)
+        std = self.predict(X)[1][target].to_numpy()
+        Xs = self._scale(X)
+        score = std.copy()
+        picked = []
+        for i in range(min(n, len(candidates))):
+            best = int(np.argmax(score))
+            picked.append(best)
+            distance = ((Xs - Xs[best])**2).sum(axis=1)
+            score = np.minimum(score, std*(1 - np.exp(-distance)))
+            score[picked] = -np.inf
+        return [candidates[i] for i in picked]
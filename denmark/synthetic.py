@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic weather years and zones for scaling benchmarks.
+
+New years are put together from blocks of days of the measured data
+(block bootstrap):
+
+- Every block of block_days days of a new year is copied from a block that
+  starts at most window days earlier or later in the year of the source
+  data, so the seasons are kept.
+- All columns, i.e. all zones and all of load, wind and solar, use the same
+  source block, so the correlation between zones and between load and
+  weather is kept within a block.
+- Inflow is drawn the same way from the ten inflow years 2003-2012, with the
+  same draw for all countries.
+
+Everything is drawn from numpy.random.default_rng(seed), so the same seed
+gives the same series. synthetic_zones() adds more zones for tests of the
+model size in zones.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from denmark.data import DATA_DIR, hours_in, load_elec, zone_name
+from denmark.remap import remap_year
+
+block_days = 7
+window = 14 # days
+
+
+def _source_days(n_days, n_source_days, rng):
+    """Day of the source year for every day of a new year with n_days days"""
+
+    days = np.arange(n_days)
+    block = days//block_days
+    n_blocks = block[-1] + 1
+    offset = rng.integers(-window, window + 1, size=n_blocks)
+    start = np.clip(np.arange(n_blocks)*block_days + offset, 0, n_source_days - block_days)
+    return np.minimum(start[block] + days - block*block_days, n_source_days - 1)
+
+
+def synthetic_elec(years, seed=0, df_elec=None):
+    """Hourly load and generation with the columns of df_elec (load_elec() by
+    default) for every year in years, indexed by the hours of those years in
+    UTC"""
+
+    if df_elec is None:
+        df_elec = load_elec()
+    df_elec = df_elec.select_dtypes('number')
+    source_year = df_elec.index[0].year
+    source = df_elec.reindex(hours_in(source_year), method='ffill', limit=1).to_numpy()
+    n_source_days = len(source)//24
+
+    rng = np.random.default_rng(seed)
+    frames = []
+    for year in years:
+        snapshots = hours_in(year)
+        days = _source_days(len(snapshots)//24, n_source_days, rng)
+        hours = (days[:, None]*24 + np.arange(24)).ravel()
+        frames.append(pd.DataFrame(source[hours], index=snapshots, columns=df_elec.columns))
+    return pd.concat(frames)
+
+
+def synthetic_inflow(countries, years, seed=0):
+    """Hourly hydro inflow in MW per country for every year in years. The
+    source year and block of every block are drawn once for all countries"""
+
+    daily = {}
+    for country in countries:
+        inflow = pd.read_csv(os.path.join(DATA_DIR, 'Hydro_Inflow_%s.csv' % country),
+                             sep=',', index_col=False)
+        inflow.index = pd.to_datetime(inflow[['Year', 'Month', 'Day']])
+        daily[country] = inflow.Inflow*1000/24 # GWh per day to MW
+    daily = pd.DataFrame(daily)
+    # 365 days of every source year, 29 February left out
+    daily = daily[~((daily.index.month == 2) & (daily.index.day == 29))]
+    source_years = np.unique(daily.index.year)
+    source = daily.to_numpy().reshape(len(source_years), 365, len(countries))
+
+    rng = np.random.default_rng(seed)
+    frames = []
+    for year in years:
+        snapshots = hours_in(year)
+        n_days = len(snapshots)//24
+        days = _source_days(n_days, 365, rng)
+        picks = rng.integers(len(source_years), size=(n_days - 1)//block_days + 1)
+        values = source[picks[np.arange(n_days)//block_days], days]
+        index = pd.date_range('%d-01-01' % year, periods=n_days, freq='D')
+        frames.append(remap_year(pd.DataFrame(values, index=index, columns=countries), snapshots))
+    return pd.concat(frames)
+
+
+def synthetic_zones(n, years, seed=0, df_elec=None):
+    """n zones Z01, Z02, ... for every year in years, with load, wind and
+    solar columns named like in the entsoe data (Z01_load_actual_entsoe_transparency,
+    ...). The zones are block bootstraps of the zones of df_elec (load_elec()
+    by default) that have all three, in turn, each with its own draw, so they
+    are correlated with but not identical to their source zone"""
+
+    if df_elec is None:
+        df_elec = load_elec()
+    kinds = ['load_actual_entsoe_transparency', 'wind_onshore_generation_actual',
+             'solar_generation_actual']
+    prefixes = [c[:-len(kinds[0]) - 1] for c in df_elec.columns if c.endswith(kinds[0])]
+    prefixes = [p for p in prefixes if all('%s_%s' % (p, kind) in df_elec for kind in kinds)]
+
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for i in range(n):
+        prefix = prefixes[i % len(prefixes)]
+        source = df_elec[['%s_%s' % (prefix, kind) for kind in kinds]]
+        resampled = synthetic_elec(years, seed=rng.integers(2**32), df_elec=source)
+        for kind in kinds:
+            columns['Z%02d_%s' % (i + 1, kind)] = resampled['%s_%s' % (prefix, kind)]
+    return pd.DataFrame(columns)
+
+
+def synthetic_topology(n, seed=0, buses=('dk1', 'dk2', 'no2', 'se3', 'se4', 'de', 'nl')):
+    """Zones and links tables like load_topology (denmark/data.py) for the n
+    zones of synthetic_zones, named z01, z02, ... like the other model zones.
+    Every new zone is connected to two of the buses and zones before it,
+    with p_nom 500-2000 MW and length 50-500 km"""
+
+    # data columns are named like in the entsoe data, zones like in the models
+    data = ['Z%02d' % (i + 1) for i in range(n)]
+    names = [zone_name(prefix) for prefix in data]
+    zones = pd.DataFrame({'data': data,
+                          'wind': data,
+                          'technologies': 'onshorewind solar gas',
+                          'costs': 'continental',
+                          'onshorewind_max': np.nan,
+                          'solar_max': np.nan},
+                         index=pd.Index(names, name='zone'))
+
+    rng = np.random.default_rng(seed)
+    existing = list(buses)
+    links = []
+    for name in names:
+        for bus in rng.choice(existing, size=2, replace=False):
+            links.append({'name': '%s - %s' % (bus, name), 'bus0': bus, 'bus1': name,
+                          'p_nom': float(rng.integers(500, 2001)),
+                          'length': float(rng.integers(50, 501))})
+        existing.append(name)
+    return zones, pd.DataFrame(links).set_index('name')
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+"""
+Work queue for running many scenarios on several machines.
+
+The queue is a single SQLite file. A coordinator submits scenarios (see
+denmark.scenarios) and any number of workers, on this or other machines that
+can open the same file, claim one job at a time, build and solve the model
+and write the result back:
+
+    python -m denmark.workqueue runs.db worker --store results/   # on every machine
+    python -m denmark.workqueue runs.db status
+
+With --store the solved scenarios are also saved in a result store for
+python -m denmark.compare.
+
+Workers write a heartbeat while a job runs. Jobs whose worker stopped sending
+heartbeats (process killed, machine lost) are put back in the queue by
+requeue_lost(), which the coordinator and every worker call regularly. A job
+is tried at most max_attempts times. A lost worker that finishes after all
+no longer changes the job.
+
+SQLite locking needs a file system with working locks: a local disk or a
+shared disk, not every network file system.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+from functools import partial
+
+from denmark.scenarios import scenario_key
+
+heartbeat_interval = 30 # s between heartbeats of a running job
+lost_after = 120 # s without heartbeat before a job is requeued
+max_attempts = 3
+
+_schema = """
+CREATE TABLE IF NOT EXISTS jobs (
+    key TEXT PRIMARY KEY,
+    scenario TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    submitted REAL,
+    started REAL,
+    heartbeat REAL,
+    finished REAL,
+    result TEXT,
+    error TEXT
+)"""
+
+
+def worker_name():
+    """Name of this worker process, host:pid"""
+
+    return '%s:%d' % (socket.gethostname(), os.getpid())
+
+
+class WorkQueue:
+    """Jobs stored in the SQLite file path. Every method opens its own short
+    transaction, so several processes can use the same file"""
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as db:
+            db.execute(_schema)
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return _Transaction(db)
+
+    def submit(self, scenarios):
+        """Add scenarios to the queue. Scenarios that are already in the queue
+        are left alone. Returns the keys of all scenarios"""
+
+        keys = [scenario_key(scenario) for scenario in scenarios]
+        now = time.time()
+        with self._connect() as db:
+            db.executemany("INSERT OR IGNORE INTO jobs (key, scenario, submitted) VALUES (?, ?, ?)",
+                           [(key, json.dumps(scenario, sort_keys=True), now)
+                            for key, scenario in zip(keys, scenarios)])
+        return keys
+
+    def claim(self, worker):
+        """Mark the oldest queued job as running on worker. Returns (key,
+        scenario) or None if the queue is empty"""
+
+        now = time.time()
+        with self._connect() as db:
+            row = db.execute("SELECT key, scenario FROM jobs WHERE status = 'queued' "
+                             "ORDER BY submitted, key LIMIT 1").fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                       "started = ?, heartbeat = ? WHERE key = ?",
+                       (worker, now, now, row['key']))
+        return row['key'], json.loads(row['scenario'])
+
+    def heartbeat(self, key, worker):
+        """Tell the queue that worker is still running the job. Returns False
+        if the job was requeued and belongs to another worker now"""
+
+        with self._connect() as db:
+            cursor = db.execute("UPDATE jobs SET heartbeat = ? WHERE key = ? AND worker = ? "
+                                "AND status = 'running'", (time.time(), key, worker))
+        return cursor.rowcount == 1
+
+    def complete(self, key, worker, result):
+        """Store the result (JSON serialisable) of a job run by worker"""
+
+        with self._connect() as db:
+            db.execute("UPDATE jobs SET status = 'done', finished = ?, result = ?, error = NULL "
+                       "WHERE key = ? AND worker = ? AND status = 'running'",
+                       (time.time(), json.dumps(result), key, worker))
+
+    def fail(self, key, worker, error):
+        """Record an error of a job run by worker. The job is queued again
+        until it has been tried max_attempts times"""
+
+        with self._connect() as db:
+            db.execute("UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END, "
+                       "finished = ?, error = ? WHERE key = ? AND worker = ? AND status = 'running'",
+                       (max_attempts, time.time(), error, key, worker))
+
+    def requeue_lost(self, timeout=lost_after):
+        """Queue running jobs again whose worker has not sent a heartbeat for
+        timeout seconds. Returns the number of requeued jobs"""
+
+        with self._connect() as db:
+            cursor = db.execute("UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END, "
+                                "error = 'worker ' || worker || ' lost', worker = NULL "
+                                "WHERE status = 'running' AND heartbeat < ?",
+                                (max_attempts, time.time() - timeout))
+        return cursor.rowcount
+
+    def results(self, keys=None):
+        """Results of the finished jobs as a dict key: result"""
+
+        with self._connect() as db:
+            rows = db.execute("SELECT key, result FROM jobs WHERE status = 'done'").fetchall()
+        return {row['key']: json.loads(row['result']) for row in rows
+                if keys is None or row['key'] in keys}
+
+    def metrics(self, window=3600):
+        """Number of jobs per status, throughput in jobs/hour since the first
+        job started and over the last window seconds, and finished jobs and
+        mean run time per worker"""
+
+        now = time.time()
+        with self._connect() as db:
+            counts = dict(db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            first, last, done = db.execute("SELECT MIN(started), MAX(finished), COUNT(*) "
+                                           "FROM jobs WHERE status = 'done'").fetchone()
+            recent = db.execute("SELECT COUNT(*) FROM jobs WHERE status = 'done' AND finished >= ?",
+                                (now - window,)).fetchone()[0]
+            workers = db.execute("SELECT worker, COUNT(*), AVG(finished - started) FROM jobs "
+                                 "WHERE status = 'done' GROUP BY worker").fetchall()
+
+        metrics = {status: counts.get(status, 0) for status in ['queued', 'running', 'done', 'failed']}
+        metrics['jobs/hour'] = done/(last - first)*3600 if done and last > first else 0.
+        metrics['jobs/hour recent'] = recent/window*3600
+        metrics['workers'] = {worker: {'done': n, 'mean run time [s]': mean}
+                              for worker, n, mean in workers}
+        return metrics
+
+
+class _Transaction:
+    """Connection that runs the with block in one write transaction and
+    closes afterwards"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.db.close()
+
+
+def _heartbeats(queue, key, worker, stop):
+    while not stop.wait(heartbeat_interval):
+        if not queue.heartbeat(key, worker):
+            return
+
+
+def run_job(scenario, store=None, checkpoints=None):
+    """Build and solve a scenario and save it in the result store directory
+    store (see denmark.store), if given. With a checkpoints directory a job
+    that was requeued resumes from the last stage of the lost worker (see
+    denmark.checkpoint). Returns the objective and the summary table of
+    denmark.results as a JSON serialisable dict"""
+
+    from denmark import results
+    from denmark.scenarios import run
+
+    if checkpoints is not None:
+        from denmark import checkpoint
+        network = checkpoint.run(scenario, checkpoints)
+    else:
+        network = run(scenario)
+    if store is not None:
+        from denmark.store import ResultStore
+        ResultStore(store).save(scenario_key(scenario), scenario, network)
+    summary = results.summary(network).reset_index()
+    return {'objective': float(network.objective),
+            'summary': summary.to_dict(orient='list')}
+
+
+def work(path, worker=None, wait=False, poll=10, func=run_job):
+    """Claim and run jobs until the queue is empty, or with wait=True until the
+    process is stopped. Returns the number of jobs run"""
+
+    queue = WorkQueue(path)
+    worker = worker or worker_name()
+    n = 0
+    while True:
+        queue.requeue_lost()
+        job = queue.claim(worker)
+        if job is None:
+            if not wait:
+                return n
+            time.sleep(poll)
+            continue
+
+        key, scenario = job
+        stop = threading.Event()
+        beat = threading.Thread(target=_heartbeats, args=(queue, key, worker, stop), daemon=True)
+        beat.start()
+        try:
+            result = func(scenario)
+        except Exception:
+            queue.fail(key, worker, traceback.format_exc())
+        else:
+            queue.complete(key, worker, result)
+        finally:
+            stop.set()
+            beat.join()
+        n += 1
+
+
+def coordinate(path, scenarios, poll=30, report=print):
+    """Submit scenarios and wait until all of them are done or failed,
+    requeueing jobs of lost workers and reporting the metrics every poll
+    seconds. Returns the results of the scenarios"""
+
+    queue = WorkQueue(path)
+    keys = queue.submit(scenarios)
+    while True:
+        queue.requeue_lost()
+        metrics = queue.metrics()
+        if report is not None:
+            report('queued %(queued)d, running %(running)d, done %(done)d, failed %(failed)d, '
+                   '%(jobs/hour).1f jobs/hour' % metrics)
+        if not metrics['queued'] and not metrics['running']:
+            return queue.results(set(keys))
+        time.sleep(poll)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m denmark.workqueue',
+                                     description='Run or inspect a queue of Denmark scenarios')
+    parser.add_argument('path', help='SQLite file of the queue')
+    parser.add_argument('command', choices=['worker', 'status', 'requeue'])
+    parser.add_argument('--wait', action='store_true', help='keep waiting for new jobs')
+    parser.add_argument('--store', help='directory of a result store to save the solved scenarios in')
+    parser.add_argument('--checkpoints', help='directory for checkpoints shared by the workers')
+    args = parser.parse_args()
+
+    if args.command == 'worker':
+        func = partial(run_job, store=args.store, checkpoints=args.checkpoints)
+        print('%d jobs run' % work(args.path, wait=args.wait, func=func))
+    elif args.command == 'requeue':
+        print('%d jobs requeued' % WorkQueue(args.path).requeue_lost())
+    else:
+        metrics = WorkQueue(args.path).metrics()
+        for key, value in metrics.items():
+            if key != 'workers':
+                print('%s: %s' % (key, value))
+        for worker, values in metrics['workers'].items():
+            print('%s: %d done, %.0f s per job' % (worker, values['done'], values['mean run time [s]']))
+
+
+if __name__ == '__main__':
+    main()